@@ -35,7 +35,7 @@ def load_to_qdrant(papers: List[Dict], collection_name: str, host: str, port: in
     """Load papers into Qdrant vector database."""
     try:
         from qdrant_client import QdrantClient
-        from qdrant_client.models import Distance, VectorParams, PointStruct
+        from qdrant_client.models import Distance, PayloadSchemaType, PointStruct, VectorParams
         from sentence_transformers import SentenceTransformer
     except ImportError:
         print("❌ Missing dependencies. Install with:")
@@ -66,6 +66,15 @@ def load_to_qdrant(papers: List[Dict], collection_name: str, host: str, port: in
         vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
     )
 
+    # Index the payload fields permission filters match on, so filtered
+    # searches use Qdrant's payload index instead of scanning every point
+    for field_name in ("institution", "access_level", "categories"):
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=PayloadSchemaType.KEYWORD
+        )
+
     # Process papers in batches
     batch_size = 100
     points = []
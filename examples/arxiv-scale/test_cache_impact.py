@@ -30,8 +30,20 @@ queries = [
 
 user = {"institution": "MIT", "roles": ["researcher"]}
 
+# Embed all queries once in a single batch. The timed loop then passes
+# vectors straight to search(), so it measures only filtering + ANN cost,
+# which is what the cache flag affects.
+query_vectors = [
+    vector.tolist()
+    for vector in model.encode(queries, batch_size=len(queries), convert_to_numpy=True)
+]
+
+# Used for the untimed warm-up query so the benchmark user's filter cache
+# entry stays cold
+warmup_user = {"institution": "warmup", "roles": ["researcher"]}
+
 print(f"\nCollection: {collection}")
-print(f"Queries: {len(queries)}")
+print(f"Queries: {len(queries)} (embedded up front in one batch)")
 print(f"User: {user}")
 
 def run_benchmark(enable_cache, label):
@@ -43,23 +55,27 @@ def run_benchmark(enable_cache, label):
         client=client,
         collection=collection,
         policy=policy,
-        embed_fn=model.encode,
         enable_filter_cache=enable_cache
     )
     
-    latencies = []
+    # Warm up (model load, imports, connection) outside the timed loop
+    retriever.search(query=query_vectors[0], user=warmup_user, limit=10)
     
-    for i, query in enumerate(queries):
-        start = time.time()
-        results = retriever.search(query=query, user=user, limit=10)
-        latency = (time.time() - start) * 1000  # Convert to ms
-        latencies.append(latency)
+    # Nanosecond monotonic timer, converted to ms only when reporting
+    latencies_ns = np.empty(len(queries), dtype=np.int64)
+    
+    for i, query_vector in enumerate(query_vectors):
+        start = time.perf_counter_ns()
+        results = retriever.search(query=query_vector, user=user, limit=10)
+        latencies_ns[i] = time.perf_counter_ns() - start
         
         if i < 3 or i >= len(queries) - 2:  # First 3 and last 2
-            print(f"  Query {i+1:2d}: {latency:6.2f}ms")
+            print(f"  Query {i+1:2d}: {latencies_ns[i] / 1e6:6.2f}ms")
         elif i == 3:
             print(f"  ...")
     
+    latencies = latencies_ns / 1e6  # Convert to ms
+    
     # Statistics
     stats = retriever.get_cache_stats()
     
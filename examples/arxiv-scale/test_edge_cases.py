@@ -3,6 +3,8 @@
 Comprehensive edge case testing for RAGGuard v0.2.0
 """
 
+from functools import lru_cache
+
 from qdrant_client import QdrantClient
 from ragguard import QdrantSecureRetriever, Policy
 from sentence_transformers import SentenceTransformer
@@ -15,6 +17,13 @@ print("=" * 70)
 client = QdrantClient("localhost", port=6333)
 model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
+
+@lru_cache(maxsize=128)
+def embed(text):
+    """Encode a query once; the tests below keep searching for the same text."""
+    return model.encode(text)
+
+
 tests_passed = 0
 tests_failed = 0
 
@@ -54,7 +63,7 @@ def test_large_list():
         client=client,
         collection="arxiv_2400_papers",
         policy=policy,
-        embed_fn=model.encode
+        embed_fn=embed
     )
 
     results = retriever.search("test", user={"id": "test"}, limit=5)
@@ -86,7 +95,7 @@ def test_multiple_negations():
         client=client,
         collection="arxiv_2400_papers",
         policy=policy,
-        embed_fn=model.encode
+        embed_fn=embed
     )
 
     results = retriever.search("test", user={"id": "test"}, limit=10)
@@ -11,7 +11,10 @@ Policy Model:
                       but CANNOT see docs from other institutions
 """
 
+from functools import lru_cache
+
 from qdrant_client import QdrantClient
+from qdrant_client.models import FieldCondition, Filter, MatchValue
 from ragguard import QdrantSecureRetriever, Policy
 from sentence_transformers import SentenceTransformer
 from ragguard.policy.engine import PolicyEngine
@@ -21,9 +24,19 @@ print("Institution-Scoped Admin Test")
 print("=" * 70)
 
 # Setup
-client = QdrantClient("localhost", port=6333)
+client = QdrantClient("localhost", port=6333, grpc_port=6334, prefer_grpc=True)
 model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
+# Payload fields the policy and the checks read; searches fetch nothing else
+PAYLOAD_FIELDS = ["institution", "access_level"]
+
+
+@lru_cache(maxsize=128)
+def embed(text):
+    """Encode a query once; the tests below keep searching for the same text."""
+    return model.encode(text)
+
+
 # Define institution-scoped admin policy
 policy = Policy.from_dict({
     "version": "1",
@@ -55,7 +68,7 @@ retriever = QdrantSecureRetriever(
     client=client,
     collection="arxiv_2400_papers",
     policy=policy,
-    embed_fn=model.encode,
+    embed_fn=embed,
     enable_filter_cache=True
 )
 
@@ -80,7 +93,7 @@ print("Test 1: MIT Admin - Should see ALL MIT docs, NO Stanford docs")
 print("=" * 70)
 
 # Query as MIT admin
-results = retriever.search("machine learning", user=mit_admin, limit=20)
+results = retriever.search("machine learning", user=mit_admin, limit=20, with_payload=PAYLOAD_FIELDS)
 
 # Analyze results
 mit_count = 0
@@ -141,7 +154,7 @@ print("Test 2: Stanford Admin - Should see ALL Stanford docs, NO MIT docs")
 print("=" * 70)
 
 # Query as Stanford admin
-results = retriever.search("machine learning", user=stanford_admin, limit=20)
+results = retriever.search("machine learning", user=stanford_admin, limit=20, with_payload=PAYLOAD_FIELDS)
 
 # Analyze results
 mit_count = 0
@@ -186,17 +199,25 @@ print("\n" + "=" * 70)
 print("Test 3: Verify Regular Users Don't Get Admin Privileges")
 print("=" * 70)
 
-# MIT researcher should NOT see restricted docs (even from MIT)
-results = retriever.search("machine learning", user=mit_researcher, limit=20)
-
-mit_restricted_count = 0
-for r in results:
-    if r.payload.get("institution") == "MIT" and r.payload.get("access_level") == "restricted":
-        mit_restricted_count += 1
+# MIT researcher should NOT see restricted docs (even from MIT).
+# Count them in Qdrant under the researcher's own permission filter: no
+# vector search needed, and it covers the whole collection, not one top 20
+permission_filter = retriever.preview_filter(mit_researcher)["filter"]
+mit_restricted_conditions = [
+    FieldCondition(key="institution", match=MatchValue(value="MIT")),
+    FieldCondition(key="access_level", match=MatchValue(value="restricted")),
+]
+if permission_filter is not None:
+    mit_restricted_conditions.append(permission_filter)
+
+mit_restricted_count = client.count(
+    collection_name="arxiv_2400_papers",
+    count_filter=Filter(must=mit_restricted_conditions),
+    exact=True
+).count
 
 print(f"\n📊 MIT Researcher Results:")
-print(f"   Total results: {len(results)}")
-print(f"   MIT restricted docs: {mit_restricted_count}")
+print(f"   MIT restricted docs visible: {mit_restricted_count}")
 
 # Note: Researcher might see restricted docs if the policy allows it
 # Let's verify with policy engine
@@ -206,7 +227,7 @@ researcher_can_access = engine.evaluate(mit_researcher, test_doc_restricted)
 test3_passed = not researcher_can_access or mit_restricted_count == 0
 
 print(f"\n   Policy evaluation: MIT researcher {'CAN' if researcher_can_access else 'CANNOT'} access restricted MIT docs")
-print(f"   Actual results: {mit_restricted_count} restricted MIT docs returned")
+print(f"   Actual: {mit_restricted_count} restricted MIT docs visible")
 
 if not researcher_can_access and mit_restricted_count == 0:
     print(f"   ✅ PASS: Researcher correctly denied restricted access")
@@ -221,7 +242,7 @@ print("Test 4: Cross-Institution Isolation")
 print("=" * 70)
 
 # MIT admin queries, should NOT get Stanford restricted docs
-results_mit_admin = retriever.search("quantum computing", user=mit_admin, limit=20)
+results_mit_admin = retriever.search("quantum computing", user=mit_admin, limit=20, with_payload=PAYLOAD_FIELDS)
 stanford_restricted_in_mit_admin = 0
 
 for r in results_mit_admin:
@@ -232,7 +253,7 @@ for r in results_mit_admin:
             stanford_restricted_in_mit_admin += 1
 
 # Stanford admin queries, should NOT get MIT restricted docs
-results_stanford_admin = retriever.search("quantum computing", user=stanford_admin, limit=20)
+results_stanford_admin = retriever.search("quantum computing", user=stanford_admin, limit=20, with_payload=PAYLOAD_FIELDS)
 mit_restricted_in_stanford_admin = 0
 
 for r in results_stanford_admin:
@@ -8,6 +8,9 @@ Verifies perfect isolation between tenants:
 - Permission changes in Tenant A don't affect Tenant B
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 from qdrant_client import QdrantClient
 from ragguard import QdrantSecureRetriever, load_policy
 from sentence_transformers import SentenceTransformer
@@ -18,15 +21,26 @@ print("Multi-Tenant Isolation Test")
 print("=" * 70)
 
 # Setup
-client = QdrantClient("localhost", port=6333)
+client = QdrantClient("localhost", port=6333, grpc_port=6334, prefer_grpc=True)
 policy = load_policy("policy.yaml")
 model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
+# Payload fields the policy reads (Test 1 re-checks results with the engine);
+# searches fetch nothing else
+PAYLOAD_FIELDS = ["institution", "access_level", "granted_users"]
+
+
+@lru_cache(maxsize=128)
+def embed(text):
+    """Encode a query once; the tests below keep searching for the same text."""
+    return model.encode(text)
+
+
 retriever = QdrantSecureRetriever(
     client=client,
     collection="arxiv_2400_papers",
     policy=policy,
-    embed_fn=model.encode,
+    embed_fn=embed,
     enable_filter_cache=True
 )
 
@@ -56,10 +70,19 @@ print("=" * 70)
 
 test1_passed = True
 
-print("\n📋 Tenant A (MIT) users:")
-for user in TENANT_A_USERS:
-    results = retriever.search("machine learning", user=user, limit=10)
 
+def search_machine_learning(user):
+    """Test 1 query for one user, through the secure retriever."""
+    return retriever.search("machine learning", user=user, limit=10, with_payload=PAYLOAD_FIELDS)
+
+
+# Run all users' searches concurrently; the checks below stay sequential
+with ThreadPoolExecutor(max_workers=len(TENANT_A_USERS) + len(TENANT_B_USERS)) as pool:
+    tenant_a_results = pool.map(search_machine_learning, TENANT_A_USERS)
+    tenant_b_results = pool.map(search_machine_learning, TENANT_B_USERS)
+
+print("\n📋 Tenant A (MIT) users:")
+for user, results in zip(TENANT_A_USERS, tenant_a_results):
     # Check that no Stanford-only docs are returned
     # BUT: Admins/reviewers have full access per policy, so they CAN see other institutions
     stanford_only_count = 0
@@ -81,9 +104,7 @@ for user in TENANT_A_USERS:
         test1_passed = False
 
 print("\n📋 Tenant B (Stanford) users:")
-for user in TENANT_B_USERS:
-    results = retriever.search("machine learning", user=user, limit=10)
-
+for user, results in zip(TENANT_B_USERS, tenant_b_results):
     # Check that no MIT-only docs are returned
     mit_only_count = 0
     for r in results:
@@ -118,7 +139,7 @@ initial_stats = retriever.get_cache_stats()
 
 # Tenant A user queries
 alice = TENANT_A_USERS[0]
-results_a1 = retriever.search("quantum computing", user=alice, limit=10)
+results_a1 = retriever.search("quantum computing", user=alice, limit=10, with_payload=False)
 cache_stats_after_a = retriever.get_cache_stats()
 
 miss_increase_a = cache_stats_after_a['misses'] - initial_stats['misses']
@@ -127,7 +148,7 @@ print(f"   Cache misses increased by: {miss_increase_a} (expected: 1)")
 
 # Tenant B user queries with SAME query
 david = TENANT_B_USERS[0]
-results_b1 = retriever.search("quantum computing", user=david, limit=10)
+results_b1 = retriever.search("quantum computing", user=david, limit=10, with_payload=False)
 cache_stats_after_b = retriever.get_cache_stats()
 
 miss_increase_b = cache_stats_after_b['misses'] - cache_stats_after_a['misses']
@@ -138,7 +159,7 @@ print(f"   Cache misses increased by: {miss_increase_b} (expected: 1, different
 cache_isolated = miss_increase_b == 1  # Should be a miss for different user
 
 # Same tenant, same query should hit cache
-results_a2 = retriever.search("quantum computing", user=alice, limit=10)
+results_a2 = retriever.search("quantum computing", user=alice, limit=10, with_payload=False)
 cache_stats_after_a2 = retriever.get_cache_stats()
 
 hit_increase = cache_stats_after_a2['hits'] - cache_stats_after_b['hits']
@@ -169,8 +190,8 @@ retriever.invalidate_filter_cache()
 
 # Both tenants query
 print(f"\n   Initial queries:")
-alice_results_before = retriever.search("computer vision", user=alice, limit=10)
-david_results_before = retriever.search("computer vision", user=david, limit=10)
+alice_results_before = retriever.search("computer vision", user=alice, limit=10, with_payload=False)
+david_results_before = retriever.search("computer vision", user=david, limit=10, with_payload=False)
 print(f"   MIT user: {len(alice_results_before)} results")
 print(f"   Stanford user: {len(david_results_before)} results")
 
@@ -180,8 +201,8 @@ alice_new = {"id": "alice", "institution": "MIT", "roles": ["admin"]}  # Promote
 print(f"\n   MIT user role changed: researcher → admin")
 
 # Query again
-alice_results_after = retriever.search("computer vision", user=alice_new, limit=10)
-david_results_after = retriever.search("computer vision", user=david, limit=10)
+alice_results_after = retriever.search("computer vision", user=alice_new, limit=10, with_payload=False)
+david_results_after = retriever.search("computer vision", user=david, limit=10, with_payload=False)
 
 print(f"   MIT user (new role): {len(alice_results_after)} results")
 print(f"   Stanford user: {len(david_results_after)} results")
@@ -5,6 +5,7 @@ Contains common functions used across all database backend filter builders.
 """
 
 import logging
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Optional
 
 from ..constants import (
@@ -208,6 +209,10 @@ def parse_list_literal(expr: str) -> Optional[list[Any]]:
     - [1, 2, 3] -> [1, 2, 3]
     - ['cs.AI', 'cs.LG'] -> ['cs.AI', 'cs.LG']
 
+    Filter builders call this for the same condition strings on every
+    filter build, so parsed lists are memoized; each call still returns a
+    new list so callers can't modify the cached values.
+
     Args:
         expr: Expression string to parse
 
@@ -217,8 +222,15 @@ def parse_list_literal(expr: str) -> Optional[list[Any]]:
     Raises:
         ValueError: If the list literal is malformed
     """
-    expr = expr.strip()
+    parsed = _parse_list_literal_cached(expr.strip())
+    if parsed is None:
+        return None
+    return list(parsed)
+
 
+@lru_cache(maxsize=256)
+def _parse_list_literal_cached(expr: str) -> Optional[tuple[Any, ...]]:
+    """Parse a stripped list literal (see parse_list_literal) into a tuple."""
     # Check if it's a list literal
     if not expr.startswith('['):
         return None
@@ -238,7 +250,7 @@ def parse_list_literal(expr: str) -> Optional[list[Any]]:
 
     # Empty list
     if not content:
-        return []
+        return ()
 
     # Check for nested lists (simple heuristic)
     if '[' in content or ']' in content:
@@ -296,7 +308,7 @@ def parse_list_literal(expr: str) -> Optional[list[Any]]:
             f"  Each element should be a quoted string, number, or boolean"
         )
 
-    return items
+    return tuple(items)
 
 
 def validate_sql_identifier(value: str, param_name: str) -> None:
@@ -10,13 +10,19 @@ import hashlib
 import json
 import threading
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Set, Tuple
 
 from ..types import CachedFilter, HasModelDump
 
 if TYPE_CHECKING:
     from ..policy.models import Policy
 
+# Sentinel for cache misses (a cached filter may itself be None)
+_MISSING = object()
+
+# Scalar user values that can go into a tuple key as-is (tagged with their type)
+_SCALAR_TYPES = (str, int, float, bool)
+
 
 class FilterCache:
     """
@@ -53,7 +59,7 @@ class FilterCache:
             raise ValueError(f"max_size must be positive, got {max_size}")
 
         self._max_size = max_size
-        self._cache: OrderedDict[str, CachedFilter] = OrderedDict()
+        self._cache: OrderedDict[Hashable, CachedFilter] = OrderedDict()
         self._lock = threading.RLock()
         self._lock_timeout = lock_timeout if lock_timeout >= 0 else None
 
@@ -79,14 +85,15 @@ class FilterCache:
             )
         return acquired
 
-    def get(self, key: str) -> Optional[CachedFilter]:
+    def get(self, key: Hashable) -> Optional[CachedFilter]:
         """
         Retrieve a cached filter by key.
 
         This operation is thread-safe and updates the LRU order.
 
         Args:
-            key: Cache key (typically "backend:policy_hash:user_hash")
+            key: Cache key (typically "backend:policy_hash:user_hash", or a
+                 tuple from CacheKeyBuilder.build_tuple_key)
 
         Returns:
             The cached filter object, or None if not found
@@ -96,18 +103,18 @@ class FilterCache:
         """
         self._acquire_lock()
         try:
-            if key in self._cache:
-                # Move to end (mark as recently used)
-                self._cache.move_to_end(key)
-                self._hits += 1
-                return self._cache[key]
-            else:
+            value = self._cache.get(key, _MISSING)
+            if value is _MISSING:
                 self._misses += 1
                 return None
+            # Move to end (mark as recently used)
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return value
         finally:
             self._lock.release()
 
-    def set(self, key: str, value: CachedFilter) -> None:
+    def set(self, key: Hashable, value: CachedFilter) -> None:
         """
         Store a filter in the cache.
 
@@ -137,7 +144,7 @@ class FilterCache:
         finally:
             self._lock.release()
 
-    def invalidate(self, key: str) -> bool:
+    def invalidate(self, key: Hashable) -> bool:
         """
         Remove a specific entry from the cache.
 
@@ -233,7 +240,7 @@ class FilterCache:
         finally:
             self._lock.release()
 
-    def __contains__(self, key: str) -> bool:
+    def __contains__(self, key: Hashable) -> bool:
         """
         Check if a key is in the cache.
 
@@ -326,6 +333,74 @@ class CacheKeyBuilder:
         # Use first 32 chars for balance between uniqueness and key length
         return hashlib.sha256(json_str.encode()).hexdigest()[:32]
 
+    @staticmethod
+    def compile_fields(relevant_fields: Set[str]) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Pre-sort and pre-split relevant user fields for build_tuple_key.
+
+        Args:
+            relevant_fields: Set of field names like {"roles", "metadata.team"}
+
+        Returns:
+            Tuple of split field paths in sorted field order
+        """
+        return tuple(tuple(field.split(".")) for field in sorted(relevant_fields))
+
+    @staticmethod
+    def build_tuple_key(
+        backend: str,
+        policy_hash: str,
+        user: Dict[str, Any],
+        field_paths: Tuple[Tuple[str, ...], ...]
+    ) -> Tuple[Any, ...]:
+        """
+        Build a hashable cache key without serializing or hashing the user.
+
+        This is the hot path used by PolicyEngine.to_filter. The key holds the
+        normalized user values directly, so dict lookup compares them by
+        equality and two different users can never share an entry (no digest
+        collisions to worry about). Values are tagged with their type so that
+        e.g. True, 1 and 1.0 stay distinct, matching build_key.
+
+        Args:
+            backend: Database backend (e.g., "qdrant", "pgvector")
+            policy_hash: Hash of the policy object
+            user: User context dictionary
+            field_paths: Output of compile_fields() for the relevant fields
+
+        Returns:
+            Tuple cache key
+        """
+        values = []
+        for path in field_paths:
+            value = user
+            for key in path:
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(key)
+                if value is None:
+                    break
+            values.append(CacheKeyBuilder._normalize_value(value))
+        return (backend, policy_hash, tuple(values))
+
+    @staticmethod
+    def _normalize_value(value: Any) -> Hashable:
+        """
+        Convert a user field value into a hashable, type-tagged form.
+
+        Lists and sets are order-insensitive, as in _compute_user_hash. Other
+        non-scalar values fall back to their sorted JSON encoding.
+        """
+        if value is None:
+            return None
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            return (value_type, value)
+        if isinstance(value, (list, set)):
+            return (list, tuple(sorted((type(v).__name__, str(v)) for v in value)))
+        return (object, json.dumps(value, sort_keys=True, default=str))
+
     @staticmethod
     def _get_nested_field(obj: Dict[str, Any], field_path: str) -> Any:
         """
@@ -18,6 +18,7 @@ from .evaluator import CompiledConditionEvaluator
 from .models import (
     CompiledCondition,
     CompiledExpression,
+    CompiledPredicate,
     CompiledValue,
     ConditionOperator,
     ConditionType,
@@ -25,6 +26,10 @@ from .models import (
     ValueType,
 )
 
+# Re-export the optimizer and predicate compiler
+from .optimizer import ConditionOptimizer
+from .predicate_compiler import PredicateCompiler
+
 # Define public API
 __all__ = [
     # Enums
@@ -36,8 +41,11 @@ __all__ = [
     "CompiledValue",
     "CompiledCondition",
     "CompiledExpression",
-    # Compiler
+    "CompiledPredicate",
+    # Compilers
     "ConditionCompiler",
+    "ConditionOptimizer",
+    "PredicateCompiler",
     # Evaluator
     "CompiledConditionEvaluator",
 ]
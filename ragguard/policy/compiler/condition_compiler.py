@@ -8,7 +8,9 @@ runtime string parsing overhead.
 import logging
 import math
 import re
-from typing import List, Union
+import sys
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 
 from .models import (
     CompiledCondition,
@@ -73,6 +75,17 @@ def _unescape_string(s: str) -> str:
     return ''.join(result)
 
 
+def _intern_path(field_path: str) -> Tuple[str, ...]:
+    """
+    Split a dotted field path into interned segments.
+
+    Field names repeat across conditions and rules and are used as dict
+    keys on every evaluation; interning lets those lookups compare by
+    identity when the document keys are interned too.
+    """
+    return tuple(sys.intern(part) for part in field_path.split("."))
+
+
 class ConditionCompiler:
     """
     Compiles string conditions to efficient AST-like representations.
@@ -104,8 +117,18 @@ class ConditionCompiler:
 
             >>> compile_expression("(user.role == 'admin' OR user.role == 'manager')")
             CompiledExpression(OR, 2 children)
+
+        Note:
+            The parse is memoized by condition string, so every filter backend
+            and policy engine handling the same condition shares one parse.
+            Each call returns fresh nodes: changing a returned tree (or a list
+            literal a backend emitted from it) never affects another caller.
         """
-        condition = condition.strip()
+        return _copy_compiled(_compile_expression_cached(condition.strip()))
+
+    @staticmethod
+    def _compile_expression(condition: str) -> Union[CompiledCondition, CompiledExpression]:
+        """Parse a stripped condition string (see compile_expression)."""
         original = condition
 
         # Check if condition contains OR/AND logic (outside of quotes)
@@ -418,8 +441,17 @@ class ConditionCompiler:
 
             >>> compile_condition("user.id in document.shared_with")
             CompiledCondition(IN, user.id, document.shared_with)
+
+        Note:
+            Like compile_expression, the parse is memoized by condition string
+            (rule validation and compound expressions reuse the same parse)
+            and each call returns fresh nodes.
         """
-        condition = condition.strip()
+        return _copy_compiled(_compile_condition_cached(condition.strip()))
+
+    @staticmethod
+    def _compile_condition(condition: str) -> CompiledCondition:
+        """Parse a stripped simple condition string (see compile_condition)."""
         original = condition
 
         # Check for common operator mistakes before parsing
@@ -528,7 +560,7 @@ class ConditionCompiler:
         # Handle user context fields
         if expr.startswith("user."):
             field_path = expr[5:]  # Remove "user." prefix
-            path_parts = tuple(field_path.split("."))
+            path_parts = _intern_path(field_path)
             return CompiledValue(
                 value_type=ValueType.USER_FIELD,
                 value=None,  # Value resolved at runtime
@@ -538,7 +570,7 @@ class ConditionCompiler:
         # Handle document context fields
         if expr.startswith("document."):
             field_path = expr[9:]  # Remove "document." prefix
-            path_parts = tuple(field_path.split("."))
+            path_parts = _intern_path(field_path)
             return CompiledValue(
                 value_type=ValueType.DOCUMENT_FIELD,
                 value=None,  # Value resolved at runtime
@@ -720,3 +752,49 @@ class ConditionCompiler:
             value=expr,
             field_path=()
         )
+
+
+def _copy_compiled(
+    node: Union[CompiledCondition, CompiledExpression]
+) -> Union[CompiledCondition, CompiledExpression]:
+    """
+    Build a fresh copy of a cached compiled tree.
+
+    Cached trees are shared across policies, so callers get their own nodes
+    and their own list literals. Field paths are tuples and are shared.
+    """
+    if isinstance(node, CompiledExpression):
+        return CompiledExpression(
+            operator=node.operator,
+            children=[_copy_compiled(child) for child in node.children],
+            original=node.original,
+        )
+    return CompiledCondition(
+        operator=node.operator,
+        left=_copy_value(node.left),
+        right=_copy_value(node.right),
+        original=node.original,
+        condition_type=node.condition_type,
+    )
+
+
+def _copy_value(value: Optional[CompiledValue]) -> Optional[CompiledValue]:
+    """Copy a compiled value (None for exists checks), including its list literal."""
+    if value is None:
+        return None
+    literal = value.value
+    if isinstance(literal, list):
+        literal = list(literal)
+    return CompiledValue(value_type=value.value_type, value=literal, field_path=value.field_path)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression_cached(condition: str) -> Union[CompiledCondition, CompiledExpression]:
+    """Compile a stripped condition string once; errors are not cached."""
+    return ConditionCompiler._compile_expression(condition)
+
+
+@lru_cache(maxsize=4096)
+def _compile_condition_cached(condition: str) -> CompiledCondition:
+    """Compile a stripped simple condition string once; errors are not cached."""
+    return ConditionCompiler._compile_condition(condition)
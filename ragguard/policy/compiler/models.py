@@ -5,9 +5,18 @@ Defines the core enums and dataclasses used to represent compiled conditions,
 values, and expressions in the policy engine.
 """
 
+import sys
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional, Tuple, Union
+from typing import Any, Callable, Optional, Tuple, Union
+
+# Compiled nodes are created once per condition but read on every evaluation,
+# so use __slots__ where dataclasses support it (Python 3.10+) for smaller
+# instances and faster attribute access
+if sys.version_info >= (3, 10):
+    _node_dataclass = dataclass(slots=True)
+else:  # pragma: no cover
+    _node_dataclass = dataclass
 
 
 class ConditionOperator(Enum):
@@ -47,7 +56,11 @@ class LogicalOperator(Enum):
     OR = "OR"
 
 
-@dataclass
+# A condition compiled to a closure: (user, document) -> bool
+CompiledPredicate = Callable[[dict[str, Any], dict[str, Any]], bool]
+
+
+@_node_dataclass
 class CompiledValue:
     """
     A compiled value expression.
@@ -66,7 +79,7 @@ class CompiledValue:
         return f"CompiledValue({self.value_type.name}, {self.value})"
 
 
-@dataclass
+@_node_dataclass
 class CompiledCondition:
     """
     A compiled condition expression.
@@ -84,7 +97,7 @@ class CompiledCondition:
         return f"CompiledCondition({self.operator.name}, {self.left}, {self.right})"
 
 
-@dataclass
+@_node_dataclass
 class CompiledExpression:
     """
     Represents a logical expression tree for OR/AND operations.
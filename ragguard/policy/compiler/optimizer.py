@@ -0,0 +1,277 @@
+"""
+Boolean optimizations for compiled condition trees.
+
+Rewrites a CompiledCondition/CompiledExpression tree into an equivalent,
+cheaper tree before it is turned into a predicate:
+
+- Conditions comparing two literals (e.g. ``1 > 2``) are folded to True/False
+- Nested AND/AND and OR/OR expressions are flattened
+- Duplicate children are dropped (``A OR A`` -> ``A``)
+- Constant children are simplified (``A AND True`` -> ``A``, ``A OR True`` -> True)
+- OR chains of equality/membership tests on the same field are merged into a
+  single literal-list membership test, e.g.
+  ``document.f == 'a' OR document.f == 'b'`` -> ``document.f in ['a', 'b']``
+- In an AND, a string equality on a field decides every other string test on
+  that field: ``f == 'a' AND f != 'b'`` -> ``f == 'a'`` and
+  ``f == 'a' AND f == 'b'`` -> False
+
+Security Note:
+    Every rewrite preserves the evaluator's semantics, including deny on
+    missing fields: ``f == x`` is secure_compare(f, x) and ``f in [...]`` is
+    secure_contains, which is exactly an OR of secure_compare over the items.
+    The merged membership test also scans every item, so it no longer leaks
+    which branch of the OR matched. Pruning under an equality relies on only
+    strings comparing equal to a string, which holds for every JSON value.
+"""
+
+from typing import Any, Optional, Tuple, Union
+
+from .evaluator import CompiledConditionEvaluator
+from .models import (
+    CompiledCondition,
+    CompiledExpression,
+    CompiledValue,
+    ConditionOperator,
+    ConditionType,
+    LogicalOperator,
+    ValueType,
+)
+
+Node = Union[CompiledCondition, CompiledExpression]
+
+_FIELD_TYPES = (ValueType.USER_FIELD, ValueType.DOCUMENT_FIELD)
+
+# Literals that may be merged into a membership list
+_SCALAR_LITERAL_TYPES = (ValueType.LITERAL_STRING, ValueType.LITERAL_NUMBER, ValueType.LITERAL_BOOL)
+
+_CONSTANT_TYPES = _SCALAR_LITERAL_TYPES + (ValueType.LITERAL_NONE, ValueType.LITERAL_LIST)
+
+
+class ConditionOptimizer:
+    """
+    Simplifies compiled condition trees.
+
+    Optimization is done once per policy, before predicate compilation.
+    """
+
+    @staticmethod
+    def optimize(node: Node) -> Union[Node, bool]:
+        """
+        Optimize a condition or expression tree.
+
+        Args:
+            node: Compiled condition or expression
+
+        Returns:
+            An equivalent node, or True/False if the node is constant
+        """
+        if isinstance(node, CompiledExpression):
+            return ConditionOptimizer._optimize_expression(node)
+        if isinstance(node, CompiledCondition):
+            return ConditionOptimizer._fold_constant(node)
+        return node
+
+    @staticmethod
+    def _fold_constant(condition: CompiledCondition) -> Union[CompiledCondition, bool]:
+        """Evaluate a condition that references no fields at compile time."""
+        sides = [condition.left] if condition.right is None else [condition.left, condition.right]
+        if all(side.value_type in _CONSTANT_TYPES for side in sides):
+            return CompiledConditionEvaluator.evaluate_node(condition, {}, {})
+        return condition
+
+    @staticmethod
+    def _optimize_expression(expr: CompiledExpression) -> Union[Node, bool]:
+        """Flatten, simplify and deduplicate an AND/OR expression."""
+        is_and = expr.operator == LogicalOperator.AND
+        # The value that decides the expression on its own, and the neutral one
+        absorbing = not is_and
+
+        children: list[Node] = []
+        pending = list(expr.children)
+        while pending:
+            child = ConditionOptimizer.optimize(pending.pop(0))
+            if child is absorbing:
+                return absorbing
+            if child is (not absorbing):
+                continue
+            if isinstance(child, CompiledExpression) and child.operator == expr.operator:
+                # Same operator: lift grandchildren into this expression
+                pending[:0] = child.children
+                continue
+            if not any(_same_node(child, existing) for existing in children):
+                children.append(child)
+
+        if is_and:
+            pruned = _prune_under_equality(children)
+            if pruned is False:
+                return False
+            children = pruned
+        else:
+            children = _merge_membership(children, expr.original)
+
+        if not children:
+            # Empty AND is vacuously true; empty OR can never match
+            return is_and
+        if len(children) == 1:
+            return children[0]
+        return CompiledExpression(operator=expr.operator, children=children, original=expr.original)
+
+
+def _same_node(a: Node, b: Node) -> bool:
+    """Structural equality, ignoring the original source text."""
+    if isinstance(a, CompiledCondition) and isinstance(b, CompiledCondition):
+        return a.operator == b.operator and a.left == b.left and a.right == b.right
+    if isinstance(a, CompiledExpression) and isinstance(b, CompiledExpression):
+        return (
+            a.operator == b.operator
+            and len(a.children) == len(b.children)
+            and all(_same_node(x, y) for x, y in zip(a.children, b.children))
+        )
+    return False
+
+
+def _membership_items(condition: Node) -> Optional[Tuple[CompiledValue, list[Any]]]:
+    """
+    Return (field, literal items) if a node is ``field == literal`` or
+    ``field in [literals]``, else None.
+    """
+    if not isinstance(condition, CompiledCondition) or condition.right is None:
+        return None
+
+    left, right = condition.left, condition.right
+    if condition.operator == ConditionOperator.EQUALS:
+        if left.value_type in _FIELD_TYPES and right.value_type in _SCALAR_LITERAL_TYPES:
+            return left, [right.value]
+        if right.value_type in _FIELD_TYPES and left.value_type in _SCALAR_LITERAL_TYPES:
+            return right, [left.value]
+        return None
+
+    if (condition.operator == ConditionOperator.IN
+            and left.value_type in _FIELD_TYPES
+            and right.value_type == ValueType.LITERAL_LIST
+            and isinstance(right.value, list)):
+        return left, list(right.value)
+
+    return None
+
+
+def _merge_membership(children: list[Node], original: str) -> list[Node]:
+    """Merge OR'ed equality/membership tests on the same field into one list test."""
+    groups: dict[Tuple[ValueType, Tuple[str, ...]], list[int]] = {}
+    for index, child in enumerate(children):
+        found = _membership_items(child)
+        if found is not None:
+            field = found[0]
+            groups.setdefault((field.value_type, field.field_path), []).append(index)
+
+    merged: dict[int, CompiledCondition] = {}
+    dropped: set[int] = set()
+    for indices in groups.values():
+        if len(indices) < 2:
+            continue
+        field = None
+        items: list[Any] = []
+        for index in indices:
+            field, values = _membership_items(children[index])
+            for value in values:
+                # Keep the first occurrence; `1 == True` so compare types too
+                if not any(type(value) is type(item) and value == item for item in items):
+                    items.append(value)
+        merged[indices[0]] = CompiledCondition(
+            operator=ConditionOperator.IN,
+            left=field,
+            right=CompiledValue(ValueType.LITERAL_LIST, items, ()),
+            original=original,
+            condition_type=ConditionType.FIELD_IN_LIST,
+        )
+        dropped.update(indices[1:])
+
+    if not merged:
+        return children
+    return [
+        merged.get(index, child)
+        for index, child in enumerate(children)
+        if index not in dropped
+    ]
+
+
+def _string_test(condition: Node) -> Optional[Tuple[Tuple[ValueType, Tuple[str, ...]], Any]]:
+    """
+    Return ((field type, path), literal) for a string test on a field, else None.
+
+    The literal is a string for ==/!= and a list of strings for in/not in.
+    """
+    if not isinstance(condition, CompiledCondition) or condition.right is None:
+        return None
+
+    left, right = condition.left, condition.right
+    if condition.operator in (ConditionOperator.EQUALS, ConditionOperator.NOT_EQUALS):
+        if left.value_type in _FIELD_TYPES and right.value_type == ValueType.LITERAL_STRING:
+            return (left.value_type, left.field_path), right.value
+        if right.value_type in _FIELD_TYPES and left.value_type == ValueType.LITERAL_STRING:
+            return (right.value_type, right.field_path), left.value
+        return None
+
+    if (condition.operator in (ConditionOperator.IN, ConditionOperator.NOT_IN)
+            and left.value_type in _FIELD_TYPES
+            and right.value_type == ValueType.LITERAL_LIST
+            and isinstance(right.value, list)
+            and all(isinstance(item, str) for item in right.value)):
+        return (left.value_type, left.field_path), right.value
+
+    return None
+
+
+def _prune_under_equality(children: list[Node]) -> Union[list[Node], bool]:
+    """
+    Simplify AND'ed string tests on a field that is also tested for equality.
+
+    Once ``f == 'a'`` holds, f is the string 'a', so every other string test
+    on f is decided: it is dropped when implied and the whole AND is False
+    when contradicted. Returns the remaining children, or False.
+    """
+    pinned: dict[Tuple[ValueType, Tuple[str, ...]], str] = {}
+    for child in children:
+        if child.operator == ConditionOperator.EQUALS:
+            found = _string_test(child)
+            if found is not None:
+                field, literal = found
+                if pinned.setdefault(field, literal) != literal:
+                    return False
+
+    if not pinned:
+        return children
+
+    kept: list[Node] = []
+    for child in children:
+        found = _string_test(child)
+        if found is None or found[0] not in pinned:
+            kept.append(child)
+            continue
+
+        field, literal = found
+        value = pinned[field]
+        operator = child.operator
+        if operator == ConditionOperator.EQUALS:
+            # Keep one equality per field as the remaining test
+            if not any(_same_field_equality(existing, field) for existing in kept):
+                kept.append(child)
+            continue
+        if operator == ConditionOperator.NOT_EQUALS:
+            holds = literal != value
+        elif operator == ConditionOperator.IN:
+            holds = value in literal
+        else:
+            holds = value not in literal
+        if not holds:
+            return False
+
+    return kept
+
+
+def _same_field_equality(node: Node, field: Tuple[ValueType, Tuple[str, ...]]) -> bool:
+    """True if node is a string equality test on the given field."""
+    if node.operator != ConditionOperator.EQUALS:
+        return False
+    found = _string_test(node)
+    return found is not None and found[0] == field
@@ -0,0 +1,909 @@
+"""
+Predicate compiler for RAGGuard policy engine.
+
+Turns compiled condition trees (CompiledCondition / CompiledExpression) into
+plain Python closures of the form ``predicate(user, document) -> bool``.
+
+The closures are built once when a policy is loaded, so evaluation no longer
+walks the condition tree or dispatches on operator/value-type enums per call.
+Only closures are generated - no source code is built or passed to eval/exec,
+so policy strings can never inject code.
+
+Security Note:
+    The generated predicates preserve the exact semantics of
+    CompiledConditionEvaluator, including constant-time comparison for
+    equality and membership checks and deny-on-missing-field behavior.
+"""
+
+import hashlib
+import hmac
+import logging
+import operator as _operator
+import secrets
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from ...utils import secure_compare, secure_contains
+from .models import (
+    CompiledCondition,
+    CompiledExpression,
+    CompiledPredicate,
+    CompiledValue,
+    ConditionOperator,
+    LogicalOperator,
+    ValueType,
+)
+from .optimizer import ConditionOptimizer
+
+logger = logging.getLogger(__name__)
+
+# Resolver signature: (user, document) -> value
+_Resolver = Callable[[dict[str, Any], dict[str, Any]], Any]
+
+_FIELD_TYPES = (ValueType.USER_FIELD, ValueType.DOCUMENT_FIELD)
+
+_LITERAL_TYPES = (
+    ValueType.LITERAL_STRING,
+    ValueType.LITERAL_NUMBER,
+    ValueType.LITERAL_BOOL,
+    ValueType.LITERAL_NONE,
+    ValueType.LITERAL_LIST,
+)
+
+
+# Literal lists up to this size are matched with unrolled comparisons
+_UNROLL_MAX_SIZE = 4
+
+# Literal string lists at least this large are matched via a keyed digest set
+# (one hash per check instead of one comparison per item)
+_DIGEST_SET_MIN_SIZE = 16
+
+# Per-process secret key for digest-set membership
+_DIGEST_KEY = secrets.token_bytes(32)
+
+
+def _always_false(user: dict[str, Any], document: dict[str, Any]) -> bool:
+    """Predicate that can never be satisfied."""
+    return False
+
+
+def _always_true(user: dict[str, Any], document: dict[str, Any]) -> bool:
+    """Predicate that is always satisfied."""
+    return True
+
+
+# Relative cost of resolving a field that holds a list (e.g. authorized_users),
+# used when the list length isn't known until evaluation
+_FIELD_LIST_COST = 10
+
+# Relative cost of a digest-set lookup (encode the value, hash it, probe)
+_DIGEST_SET_COST = 2
+
+
+def estimate_cost(node: Union[CompiledCondition, CompiledExpression]) -> int:
+    """
+    Estimate the relative cost of evaluating a compiled node.
+
+    Used to evaluate cheap checks first when several conditions are ANDed
+    or ORed together. Scalar comparisons cost 1; membership in a literal
+    list costs its length (every item is compared), except for string lists
+    long enough to be matched through a digest set, which cost a small
+    constant; membership in a document/user field costs a fixed, larger
+    amount.
+    """
+    if isinstance(node, CompiledExpression):
+        return sum(estimate_cost(child) for child in node.children)
+
+    operator = node.operator
+    if operator in (ConditionOperator.IN, ConditionOperator.NOT_IN):
+        right = node.right
+        if right is not None and right.value_type == ValueType.LITERAL_LIST:
+            items = right.value
+            if (len(items) >= _DIGEST_SET_MIN_SIZE
+                    and all(_encode_str(item) is not None for item in items)):
+                cost = _DIGEST_SET_COST
+            else:
+                cost = max(1, len(items))
+        else:
+            cost = _FIELD_LIST_COST
+        if operator == ConditionOperator.NOT_IN:
+            cost += 1
+        return cost
+
+    return 1
+
+
+def required_document_keys(node: Union[CompiledCondition, CompiledExpression]) -> frozenset:
+    """
+    Top-level document keys that must be present for a node to be satisfied.
+
+    Only keys whose absence guarantees False are included: operands of
+    ==, !=, ordering and exists, the list side of in/not in, and the value
+    side of ``document.x in [literals]``. Conditions that a missing field
+    can satisfy (not exists, ``document.x not in [...]``) contribute nothing.
+    AND takes the union of its children, OR the intersection.
+    """
+    return _required_keys(node, ValueType.DOCUMENT_FIELD)
+
+
+def required_user_keys(node: Union[CompiledCondition, CompiledExpression]) -> frozenset:
+    """Top-level user keys that must be present (see required_document_keys)."""
+    return _required_keys(node, ValueType.USER_FIELD)
+
+
+def _required_keys(
+    node: Union[CompiledCondition, CompiledExpression],
+    source: ValueType
+) -> frozenset:
+    """Required top-level keys of the user or document side of a node."""
+    if isinstance(node, CompiledExpression):
+        child_keys = [_required_keys(child, source) for child in node.children]
+        if not child_keys:
+            return frozenset()
+        if node.operator == LogicalOperator.AND:
+            return frozenset().union(*child_keys)
+        return frozenset.intersection(*child_keys)
+
+    def key_of(value: Optional[CompiledValue]) -> set:
+        if value is not None and value.value_type == source and value.field_path:
+            return {value.field_path[0]}
+        return set()
+
+    operator = node.operator
+    if (operator == ConditionOperator.NOT_EXISTS
+            or (node.right is None and operator != ConditionOperator.EXISTS)):
+        return frozenset()
+    if operator in (ConditionOperator.IN, ConditionOperator.NOT_IN):
+        keys = key_of(node.right)
+        right = node.right
+        if (operator == ConditionOperator.IN
+                and right.value_type == ValueType.LITERAL_LIST
+                and isinstance(right.value, list)
+                and None not in right.value):
+            keys |= key_of(node.left)
+        return frozenset(keys)
+    return frozenset(key_of(node.left) | key_of(node.right))
+
+
+def _require_keys(required: frozenset, predicate: CompiledPredicate) -> CompiledPredicate:
+    """Guard a predicate with a cheap presence check on its required document keys."""
+    if len(required) == 1:
+        (key,) = required
+
+        def has_key(user: dict[str, Any], document: dict[str, Any]) -> bool:
+            if isinstance(document, dict) and key in document:
+                return predicate(user, document)
+            return False
+
+        return has_key
+
+    def has_keys(user: dict[str, Any], document: dict[str, Any]) -> bool:
+        if isinstance(document, dict) and document.keys() >= required:
+            return predicate(user, document)
+        return False
+
+    return has_keys
+
+
+def _order_by_cost(
+    nodes: Sequence[Union[CompiledCondition, CompiledExpression]]
+) -> list[Union[CompiledCondition, CompiledExpression]]:
+    """Sort nodes cheapest-first, keeping author order for equal costs."""
+    return sorted(nodes, key=estimate_cost)
+
+
+def _all_of(predicates: Tuple[CompiledPredicate, ...]) -> CompiledPredicate:
+    """
+    Fuse predicates into a single short-circuiting AND predicate.
+
+    Small arities are unrolled so the common one/two/three-condition rules
+    don't pay for a Python-level loop.
+    """
+    if len(predicates) == 1:
+        return predicates[0]
+
+    if len(predicates) == 2:
+        first, second = predicates
+
+        def both(user: dict[str, Any], document: dict[str, Any]) -> bool:
+            return first(user, document) and second(user, document)
+
+        return both
+
+    if len(predicates) == 3:
+        first, second, third = predicates
+
+        def all_three(user: dict[str, Any], document: dict[str, Any]) -> bool:
+            return first(user, document) and second(user, document) and third(user, document)
+
+        return all_three
+
+    def all_of(user: dict[str, Any], document: dict[str, Any]) -> bool:
+        for predicate in predicates:
+            if not predicate(user, document):
+                return False
+        return True
+
+    return all_of
+
+
+def _make_path_getter(path: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """
+    Build a getter for a pre-split field path.
+
+    Mirrors CompiledConditionEvaluator._get_nested_value: returns None when any
+    segment is missing or when an intermediate value is not a dict.
+    """
+    if len(path) == 1:
+        key = path[0]
+
+        def get_single(obj: Any) -> Any:
+            if isinstance(obj, dict):
+                return obj.get(key)
+            return None
+
+        return get_single
+
+    if len(path) == 2:
+        # Common "metadata.team" shape, unrolled to skip the loop
+        outer, inner = path
+
+        def get_pair(obj: Any) -> Any:
+            if isinstance(obj, dict):
+                value = obj.get(outer)
+                if isinstance(value, dict):
+                    return value.get(inner)
+            return None
+
+        return get_pair
+
+    if len(path) == 3:
+        # "metadata.security.level" shape
+        first, second, third = path
+
+        def get_triple(obj: Any) -> Any:
+            if isinstance(obj, dict):
+                value = obj.get(first)
+                if isinstance(value, dict):
+                    value = value.get(second)
+                    if isinstance(value, dict):
+                        return value.get(third)
+            return None
+
+        return get_triple
+
+    def get_nested(obj: Any) -> Any:
+        value = obj
+        for key in path:
+            if isinstance(value, dict):
+                value = value.get(key)
+                if value is None:
+                    return None
+            else:
+                return None
+        return value
+
+    return get_nested
+
+
+def _make_resolver(compiled_value: CompiledValue) -> _Resolver:
+    """Build a resolver closure for one side of a condition."""
+    if compiled_value.value_type == ValueType.USER_FIELD:
+        get_user = _make_path_getter(compiled_value.field_path)
+
+        def resolve_user(user: dict[str, Any], document: dict[str, Any]) -> Any:
+            return get_user(user)
+
+        return resolve_user
+
+    if compiled_value.value_type == ValueType.DOCUMENT_FIELD:
+        get_document = _make_path_getter(compiled_value.field_path)
+
+        def resolve_document(user: dict[str, Any], document: dict[str, Any]) -> Any:
+            return get_document(document)
+
+        return resolve_document
+
+    if compiled_value.value_type in _LITERAL_TYPES:
+        constant = compiled_value.value
+
+        def resolve_literal(user: dict[str, Any], document: dict[str, Any]) -> Any:
+            return constant
+
+        return resolve_literal
+
+    raise ValueError(f"Unknown value type: {compiled_value.value_type}")
+
+
+def _top_level_document_key(compiled_value: CompiledValue) -> Optional[str]:
+    """
+    Return the key of a one-segment document field (e.g. document.status).
+
+    Predicates for this very common shape probe the document directly
+    instead of going through a resolver and a path getter. Returns None
+    for every other operand.
+    """
+    if (compiled_value.value_type == ValueType.DOCUMENT_FIELD
+            and len(compiled_value.field_path) == 1):
+        return compiled_value.field_path[0]
+    return None
+
+
+def _make_string_matcher(literal: str) -> Optional[Callable[[Any], bool]]:
+    """
+    Build a constant-time equality check against a string literal.
+
+    Equivalent to ``secure_compare(value, literal)``, but the literal is
+    encoded to UTF-8 once at compile time instead of on every comparison.
+    Returns None if the literal cannot be encoded (callers fall back to
+    secure_compare).
+    """
+    try:
+        encoded = literal.encode('utf-8')
+    except UnicodeEncodeError:
+        return None
+
+    def matches(value: Any) -> bool:
+        if isinstance(value, str):
+            try:
+                return hmac.compare_digest(value.encode('utf-8'), encoded)
+            except UnicodeEncodeError:
+                return value == literal
+        return secure_compare(value, literal)
+
+    return matches
+
+
+def _encode_str(value: Any) -> Optional[bytes]:
+    """UTF-8 encode a string value, or None if it isn't an encodable string."""
+    if isinstance(value, str):
+        try:
+            return value.encode('utf-8')
+        except UnicodeEncodeError:
+            pass
+    return None
+
+
+def _make_literal_list_matcher(items: list) -> Callable[[Any], bool]:
+    """
+    Build a constant-time membership check against a literal list.
+
+    Equivalent to ``secure_contains(value, items)``, with string items
+    pre-encoded to UTF-8 at compile time and the value encoded once per call
+    rather than once per item. The strategy depends on the list:
+
+    - up to 4 strings: comparisons are unrolled (no loop); all are always
+      evaluated, combined with ``|`` so nothing short-circuits
+    - 16 or more strings: the value's keyed BLAKE2 digest is looked up in a
+      set of the items' digests. The key is random per process, so lookup
+      timing can't be correlated with the allowed values
+    - anything else (mixed types, mid-sized lists): every item is compared
+    """
+    encoded_items = [_encode_str(item) for item in items]
+
+    if len(items) <= _UNROLL_MAX_SIZE and all(b is not None for b in encoded_items):
+        return _make_unrolled_matcher(items, encoded_items)
+
+    if len(items) >= _DIGEST_SET_MIN_SIZE and all(b is not None for b in encoded_items):
+        digests = frozenset(_keyed_digest(b) for b in encoded_items)
+
+        def contains_digest(value: Any) -> bool:
+            value_bytes = _encode_str(value)
+            if value_bytes is None:
+                return secure_contains(value, items)
+            return _keyed_digest(value_bytes) in digests
+
+        return contains_digest
+
+    pairs = tuple(zip(items, encoded_items))
+
+    def contains(value: Any) -> bool:
+        value_bytes = _encode_str(value)
+        if value_bytes is None:
+            return secure_contains(value, items)
+
+        # Check all items and accumulate result to prevent timing leak
+        found = False
+        for item, item_bytes in pairs:
+            if item_bytes is not None:
+                if hmac.compare_digest(value_bytes, item_bytes):
+                    found = True
+            elif secure_compare(value, item):
+                found = True
+        return found
+
+    return contains
+
+
+def _make_unrolled_matcher(items: list, encoded: list[bytes]) -> Callable[[Any], bool]:
+    """Membership check for up to four pre-encoded strings, without a loop."""
+    compare = hmac.compare_digest
+
+    if len(encoded) == 0:
+        def contains_none(value: Any) -> bool:
+            return False
+
+        return contains_none
+
+    if len(encoded) == 1:
+        (a,) = encoded
+
+        def contains_one(value: Any) -> bool:
+            value_bytes = _encode_str(value)
+            if value_bytes is None:
+                return secure_contains(value, items)
+            return compare(value_bytes, a)
+
+        return contains_one
+
+    if len(encoded) == 2:
+        a, b = encoded
+
+        def contains_two(value: Any) -> bool:
+            value_bytes = _encode_str(value)
+            if value_bytes is None:
+                return secure_contains(value, items)
+            return compare(value_bytes, a) | compare(value_bytes, b)
+
+        return contains_two
+
+    if len(encoded) == 3:
+        a, b, c = encoded
+
+        def contains_three(value: Any) -> bool:
+            value_bytes = _encode_str(value)
+            if value_bytes is None:
+                return secure_contains(value, items)
+            return compare(value_bytes, a) | compare(value_bytes, b) | compare(value_bytes, c)
+
+        return contains_three
+
+    a, b, c, d = encoded
+
+    def contains_four(value: Any) -> bool:
+        value_bytes = _encode_str(value)
+        if value_bytes is None:
+            return secure_contains(value, items)
+        return (
+            compare(value_bytes, a) | compare(value_bytes, b)
+            | compare(value_bytes, c) | compare(value_bytes, d)
+        )
+
+    return contains_four
+
+
+def _keyed_digest(data: bytes) -> bytes:
+    """Keyed hash used for set-based membership of large literal lists."""
+    return hashlib.blake2b(data, key=_DIGEST_KEY, digest_size=16).digest()
+
+
+def _make_ordering(
+    symbol: str,
+    compare: Callable[[Any, Any], bool],
+    left: _Resolver,
+    right: _Resolver
+) -> CompiledPredicate:
+    """Build a predicate for >, <, >= or <= with type-mismatch protection."""
+
+    def ordering(user: dict[str, Any], document: dict[str, Any]) -> bool:
+        left_value = left(user, document)
+        right_value = right(user, document)
+        if left_value is None or right_value is None:
+            return False
+        try:
+            return compare(left_value, right_value)
+        except TypeError:
+            _log_type_mismatch(left_value, symbol, right_value)
+            return False
+
+    return ordering
+
+
+def _log_type_mismatch(left_value: Any, symbol: str, right_value: Any) -> None:
+    logger.warning(
+        "Type mismatch in comparison: cannot compare %s %s %s (types: %s %s %s)",
+        left_value, symbol, right_value,
+        type(left_value).__name__, symbol, type(right_value).__name__,
+        exc_info=False
+    )
+
+
+def _make_literal_ordering(
+    symbol: str,
+    compare: Callable[[Any, Any], bool],
+    field: CompiledValue,
+    constant: Any,
+    field_on_left: bool
+) -> CompiledPredicate:
+    """
+    Build an ordering predicate against a pre-bound numeric literal.
+
+    Specialization of _make_ordering for ``document.priority > 5`` and
+    ``5 < document.priority``: one field lookup and one C-level compare,
+    with no resolver calls for the constant side.
+    """
+    get = _make_path_getter(field.field_path)
+    from_user = field.value_type == ValueType.USER_FIELD
+
+    if field_on_left:
+        def field_vs_literal(user: dict[str, Any], document: dict[str, Any]) -> bool:
+            value = get(user if from_user else document)
+            if value is None:
+                return False
+            try:
+                return compare(value, constant)
+            except TypeError:
+                _log_type_mismatch(value, symbol, constant)
+                return False
+
+        return field_vs_literal
+
+    def literal_vs_field(user: dict[str, Any], document: dict[str, Any]) -> bool:
+        value = get(user if from_user else document)
+        if value is None:
+            return False
+        try:
+            return compare(constant, value)
+        except TypeError:
+            _log_type_mismatch(constant, symbol, value)
+            return False
+
+    return literal_vs_field
+
+
+# Ordering operators: symbol (for logging) and comparison function
+_ORDERINGS = {
+    ConditionOperator.GREATER_THAN: (">", _operator.gt),
+    ConditionOperator.LESS_THAN: ("<", _operator.lt),
+    ConditionOperator.GREATER_THAN_OR_EQUAL: (">=", _operator.ge),
+    ConditionOperator.LESS_THAN_OR_EQUAL: ("<=", _operator.le),
+}
+
+
+class PredicateCompiler:
+    """
+    Compiles condition trees to Python closures.
+
+    This is done once when a PolicyEngine is created; the resulting
+    predicates are called directly during evaluation.
+    """
+
+    @staticmethod
+    def compile_node(
+        node: Union[CompiledCondition, CompiledExpression]
+    ) -> CompiledPredicate:
+        """
+        Compile a condition or expression tree to a predicate.
+
+        Args:
+            node: Compiled condition or expression
+
+        Returns:
+            Callable taking (user, document) and returning True if satisfied
+
+        Raises:
+            ValueError: If the node contains an unknown operator or value type
+        """
+        if isinstance(node, CompiledCondition):
+            return PredicateCompiler.compile_condition(node)
+        if isinstance(node, CompiledExpression):
+            return PredicateCompiler.compile_expression(node)
+        raise ValueError(f"Unknown node type: {type(node)}")
+
+    @staticmethod
+    def compile_conjunction(
+        nodes: Sequence[Union[CompiledCondition, CompiledExpression]]
+    ) -> CompiledPredicate:
+        """
+        Compile a rule's condition list to one fused predicate.
+
+        Conditions listed on a rule are ANDed together; fusing them means
+        evaluation makes a single call per rule instead of looping over
+        the conditions. The list is first simplified by ConditionOptimizer,
+        then ordered cheapest-first (see estimate_cost) so the common
+        denials short-circuit early, and when there is more than one check
+        to skip, documents missing a required key (see
+        required_document_keys) are denied before any comparison.
+
+        Args:
+            nodes: Compiled conditions/expressions (must not be empty)
+
+        Returns:
+            Predicate that is True only if every node is satisfied
+
+        Raises:
+            ValueError: If nodes is empty
+        """
+        if not nodes:
+            raise ValueError("Cannot compile an empty condition list")
+
+        # Fold constants, flatten nested ANDs and merge OR'ed equality chains
+        optimized = ConditionOptimizer.optimize(
+            CompiledExpression(operator=LogicalOperator.AND, children=list(nodes), original="")
+        )
+        if optimized is True:
+            return _always_true
+        if optimized is False:
+            return _always_false
+        if isinstance(optimized, CompiledExpression) and optimized.operator == LogicalOperator.AND:
+            nodes = optimized.children
+        else:
+            nodes = [optimized]
+
+        predicate = _all_of(
+            tuple(PredicateCompiler.compile_node(node) for node in _order_by_cost(nodes))
+        )
+
+        # A lone condition already fails as soon as it sees the missing field
+        if len(nodes) > 1 or isinstance(nodes[0], CompiledExpression):
+            required = frozenset().union(*(required_document_keys(node) for node in nodes))
+            if required:
+                return _require_keys(required, predicate)
+        return predicate
+
+    @staticmethod
+    def compile_expression(expr: CompiledExpression) -> CompiledPredicate:
+        """
+        Compile an OR/AND expression tree to a short-circuiting predicate.
+
+        Args:
+            expr: Compiled expression
+
+        Returns:
+            Predicate combining the children with the expression's operator
+        """
+        # Children are side-effect free, so evaluating the cheapest first gives
+        # the same result while short-circuiting sooner
+        children = tuple(
+            PredicateCompiler.compile_node(child) for child in _order_by_cost(expr.children)
+        )
+
+        if expr.operator == LogicalOperator.AND:
+            return _all_of(children)
+
+        if expr.operator == LogicalOperator.OR:
+            def any_of(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                for child in children:
+                    if child(user, document):
+                        return True
+                return False
+
+            return any_of
+
+        raise ValueError(f"Unknown logical operator: {expr.operator}")
+
+    @staticmethod
+    def compile_condition(condition: CompiledCondition) -> CompiledPredicate:
+        """
+        Compile a single condition to a predicate.
+
+        Args:
+            condition: Compiled condition
+
+        Returns:
+            Predicate with the operator and operand resolution baked in
+        """
+        operator = condition.operator
+        left = _make_resolver(condition.left)
+
+        if operator == ConditionOperator.EXISTS:
+            def exists(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                return left(user, document) is not None
+
+            return exists
+
+        if operator == ConditionOperator.NOT_EXISTS:
+            def not_exists(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                return left(user, document) is None
+
+            return not_exists
+
+        if condition.right is None:
+            # Binary operator without a right operand can never be satisfied
+            # (matches the evaluator, which resolves the missing side to None)
+            return _always_false
+
+        right = _make_resolver(condition.right)
+
+        if operator in _ORDERINGS:
+            symbol, compare = _ORDERINGS[operator]
+            left_type, right_type = condition.left.value_type, condition.right.value_type
+            if left_type in _FIELD_TYPES and right_type == ValueType.LITERAL_NUMBER:
+                return _make_literal_ordering(
+                    symbol, compare, condition.left, condition.right.value, True
+                )
+            if left_type == ValueType.LITERAL_NUMBER and right_type in _FIELD_TYPES:
+                return _make_literal_ordering(
+                    symbol, compare, condition.right, condition.left.value, False
+                )
+            return _make_ordering(symbol, compare, left, right)
+
+        if operator in (ConditionOperator.EQUALS, ConditionOperator.NOT_EQUALS):
+            specialized = PredicateCompiler._compile_string_equality(condition)
+            if specialized is not None:
+                return specialized
+
+        if operator in (ConditionOperator.IN, ConditionOperator.NOT_IN):
+            specialized = PredicateCompiler._compile_literal_membership(condition)
+            if specialized is not None:
+                return specialized
+
+        if operator == ConditionOperator.EQUALS:
+            def equals(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                left_value = left(user, document)
+                right_value = right(user, document)
+                # Security: Don't allow None == None to grant access
+                if left_value is None or right_value is None:
+                    return False
+                return secure_compare(left_value, right_value)
+
+            return equals
+
+        if operator == ConditionOperator.NOT_EQUALS:
+            def not_equals(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                left_value = left(user, document)
+                right_value = right(user, document)
+                # Security: Missing fields should deny access, not grant it
+                if left_value is None or right_value is None:
+                    return False
+                return not secure_compare(left_value, right_value)
+
+            return not_equals
+
+        if operator == ConditionOperator.IN:
+            def contained(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                right_value = right(user, document)
+                if not isinstance(right_value, list):
+                    return False
+                return secure_contains(left(user, document), right_value)
+
+            return contained
+
+        if operator == ConditionOperator.NOT_IN:
+            def not_contained(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                right_value = right(user, document)
+                if not isinstance(right_value, list):
+                    return False
+                return not secure_contains(left(user, document), right_value)
+
+            return not_contained
+
+        raise ValueError(f"Unknown operator: {operator}")
+
+    @staticmethod
+    def _compile_string_equality(condition: CompiledCondition) -> Optional[CompiledPredicate]:
+        """
+        Specialize ==/!= against a string literal (e.g. document.status == 'active').
+
+        Returns None if neither side is a string literal.
+        """
+        if condition.right.value_type == ValueType.LITERAL_STRING:
+            field_side, literal = condition.left, condition.right.value
+        elif condition.left.value_type == ValueType.LITERAL_STRING:
+            field_side, literal = condition.right, condition.left.value
+        else:
+            return None
+
+        matches = _make_string_matcher(literal)
+        if matches is None:
+            return None
+
+        key = _top_level_document_key(field_side)
+        if key is not None:
+            negate = condition.operator == ConditionOperator.NOT_EQUALS
+
+            def document_key_equality(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                if not isinstance(document, dict):
+                    return False
+                value = document.get(key)
+                # Security: Missing fields never match, for == and != alike
+                if value is None:
+                    return False
+                # `not` yields a real bool even if the value's __eq__ doesn't
+                return (not matches(value)) is negate
+
+            return document_key_equality
+
+        resolve = _make_resolver(field_side)
+
+        if condition.operator == ConditionOperator.EQUALS:
+            def equals_literal(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                value = resolve(user, document)
+                # Security: Missing fields never match
+                if value is None:
+                    return False
+                return matches(value)
+
+            return equals_literal
+
+        def not_equals_literal(user: dict[str, Any], document: dict[str, Any]) -> bool:
+            value = resolve(user, document)
+            # Security: Missing fields should deny access, not grant it
+            if value is None:
+                return False
+            return not matches(value)
+
+        return not_equals_literal
+
+    @staticmethod
+    def _compile_literal_membership(condition: CompiledCondition) -> Optional[CompiledPredicate]:
+        """
+        Specialize in/not in where either side is a literal.
+
+        Covers ``document.category in ['cs.AI', 'cs.LG']`` and
+        ``'public' in document.tags``. Returns None for other shapes.
+        """
+        negate = condition.operator == ConditionOperator.NOT_IN
+
+        if (condition.right.value_type == ValueType.LITERAL_LIST
+                and isinstance(condition.right.value, list)):
+            contains = _make_literal_list_matcher(condition.right.value)
+
+            key = _top_level_document_key(condition.left)
+            if key is not None:
+                def document_key_in_literal_list(
+                    user: dict[str, Any], document: dict[str, Any]
+                ) -> bool:
+                    value = document.get(key) if isinstance(document, dict) else None
+                    return contains(value) is not negate
+
+                return document_key_in_literal_list
+
+            resolve = _make_resolver(condition.left)
+
+            def in_literal_list(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                return contains(resolve(user, document)) is not negate
+
+            return in_literal_list
+
+        if condition.left.value_type == ValueType.LITERAL_STRING:
+            matches = _make_string_matcher(condition.left.value)
+            if matches is None:
+                return None
+            resolve_list = _make_resolver(condition.right)
+
+            def literal_in_field(user: dict[str, Any], document: dict[str, Any]) -> bool:
+                items = resolve_list(user, document)
+                if not isinstance(items, list):
+                    return False
+                # Check all items and accumulate result to prevent timing leak
+                found = False
+                for item in items:
+                    if matches(item):
+                        found = True
+                return found is not negate
+
+            return literal_in_field
+
+        return None
+
+    @staticmethod
+    def compile_match(match: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+        """
+        Compile a rule's ``match`` block to a document-only predicate.
+
+        Field paths are split once here rather than on every document.
+        A list value matches if the document value is one of its items;
+        any other value must be equal.
+
+        Args:
+            match: Mapping of document field path to expected value(s)
+
+        Returns:
+            Callable taking a document and returning True if it matches
+        """
+        checks = tuple(
+            (_make_path_getter(tuple(key.split("."))), expected, isinstance(expected, list))
+            for key, expected in match.items()
+        )
+
+        def matches(document: dict[str, Any]) -> bool:
+            for get_value, expected, is_list in checks:
+                doc_value = get_value(document)
+                if is_list:
+                    if doc_value not in expected:
+                        return False
+                elif doc_value != expected:
+                    return False
+            return True
+
+        return matches
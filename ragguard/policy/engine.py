@@ -12,7 +12,7 @@ from typing import Any, Callable, Dict, Optional, Tuple
 from ..constants import (
     MAX_BACKEND_NAME_LENGTH,
 )
-from ..exceptions import ConditionCompilationError, PolicyEvaluationError
+from ..exceptions import PolicyEvaluationError
 from ..filters.backends.arangodb import to_arangodb_filter
 
 # Import graph filter builders
@@ -38,7 +38,8 @@ from ..filters.cache import (
     extract_user_fields_from_policy,
 )
 from ..types import FilterResult
-from .compiler import CompiledConditionEvaluator, ConditionCompiler
+from .compiler import CompiledConditionEvaluator, PredicateCompiler
+from .compiler.predicate_compiler import required_user_keys
 from .models import AllowConditions, Policy, Rule
 
 # Module logger
@@ -214,25 +215,41 @@ class PolicyEngine:
 
         # Compile all conditions at initialization time for performance
         # This avoids string parsing on every condition evaluation
-        # Supports both simple conditions and complex OR/AND expressions
-        self._compiled_conditions = {}  # rule_index -> list of (CompiledCondition | CompiledExpression)
+        # Supports both simple conditions and complex OR/AND expressions.
+        # Compilation is cached on the policy, so engines built from the same
+        # policy (e.g. by several retrievers) share the work.
+        compiled_conditions, compiled_predicates = policy._compiled_rules()
+        self._compiled_conditions = dict(compiled_conditions)  # rule_index -> list of (CompiledCondition | CompiledExpression)
+
+        # Each rule's compiled condition trees fused into one closure, so
+        # evaluate() makes a single call per rule instead of re-walking trees
+        self._compiled_predicates = dict(compiled_predicates)  # rule_index -> predicate(user, document)
+
+        # Compile each explicit rule's match block so document matching doesn't
+        # re-split field paths for every document
+        self._match_predicates = {}  # rule_index -> predicate(document)
         for i, rule in enumerate(policy.rules):
-            if rule.allow.conditions:
-                compiled = []
-                for condition_str in rule.allow.conditions:
-                    try:
-                        # Use compile_expression to support OR/AND logic
-                        compiled_node = ConditionCompiler.compile_expression(condition_str)
-                        compiled.append(compiled_node)
-                    except (ValueError, TypeError, RecursionError) as e:
-                        # Catch specific parsing/compilation errors
-                        raise ConditionCompilationError(
-                            condition=condition_str,
-                            rule_name=rule.name,
-                            reason=str(e),
-                            cause=e
-                        )
-                self._compiled_conditions[i] = compiled
+            if rule.match is not None:
+                self._match_predicates[i] = PredicateCompiler.compile_match(rule.match)
+
+        # Rules with "everyone": true never depend on who the user is, so their
+        # verdict is just their condition predicate (or True without conditions)
+        self._everyone_plans = {}  # rule_index -> True | predicate(user, document)
+        for i, rule in enumerate(policy.rules):
+            if rule.allow.everyone is True:
+                if rule.allow.conditions:
+                    if i in self._compiled_predicates:
+                        self._everyone_plans[i] = self._compiled_predicates[i]
+                else:
+                    self._everyone_plans[i] = True
+
+        # User keys each rule's conditions need; a user missing one can never
+        # satisfy the rule, which evaluate_batch settles once per batch
+        self._required_user_keys = {}  # rule_index -> frozenset of top-level user keys
+        for i, nodes in self._compiled_conditions.items():
+            required = frozenset().union(*(required_user_keys(node) for node in nodes))
+            if required:
+                self._required_user_keys[i] = required
 
         # Pre-convert role lists to sets for O(1) lookup instead of O(n)
         # This avoids repeated list iteration during role checks
@@ -248,6 +265,8 @@ class PolicyEngine:
             policy,
             compiled_conditions=self._compiled_conditions
         )
+        # Sorted, pre-split field paths so cache key building is a plain walk
+        self._user_key_paths = CacheKeyBuilder.compile_fields(self._relevant_user_fields)
 
     def evaluate(self, user: dict[str, Any], document: dict[str, Any]) -> bool:
         """
@@ -268,28 +287,147 @@ class PolicyEngine:
         - If no explicit rules match, check catch-all rules (without match conditions)
         - If no rules grant access, apply the default policy
         """
+        everyone_plans = self._everyone_plans
+
         # Check all rules with their indices for compiled condition lookup
         for i, rule in enumerate(self.policy.rules):
             # Check explicit rules first (rules with match conditions)
             if rule.match is not None:
-                if not self._document_matches_rule(document, rule):
+                if not self._rule_matches(document, rule, i):
                     continue
 
-                # This explicit rule matches the document
-                if self._user_allowed(user, document, rule.allow, i):
-                    return True  # Explicit allow
-                else:
-                    return False  # Explicit deny - don't check other rules
+                # This explicit rule matches the document; the first one decides
+                # (explicit allow, or explicit deny - don't check other rules)
+                plan = everyone_plans.get(i)
+                if plan is not None:
+                    return plan is True or plan(user, document)
+                return self._user_allowed(user, document, rule.allow, i)
 
         # No explicit rules matched, check catch-all rules (without match conditions)
         for i, rule in enumerate(self.policy.rules):
             if rule.match is None:
-                if self._user_allowed(user, document, rule.allow, i):
+                plan = everyone_plans.get(i)
+                if plan is not None:
+                    if plan is True or plan(user, document):
+                        return True  # Catch-all allow
+                elif self._user_allowed(user, document, rule.allow, i):
                     return True  # Catch-all allow
 
         # No rules granted access, apply default
         return self.policy.default == "allow"
 
+    def evaluate_batch(
+        self,
+        user: dict[str, Any],
+        documents: list[dict[str, Any]]
+    ) -> list[bool]:
+        """
+        Evaluate if a user can access each of several documents.
+
+        Equivalent to ``[self.evaluate(user, doc) for doc in documents]``, but
+        the document-independent work (role checks, rules that can never or
+        always grant access to this user) is done once per call instead of
+        once per document. Intended for post-filtering candidate batches.
+
+        Args:
+            user: User context (id, roles, department, etc.)
+            documents: Document metadata dicts
+
+        Returns:
+            List of booleans, one per document, in the same order
+        """
+        # Each rule's plan (_user_rule_plan) is resolved once per call, and
+        # only when evaluate() would consult that rule: a malformed user field
+        # in a rule no document reaches must not fail the batch
+        rules = self.policy.rules
+        explicit_rules = [(rule, i) for i, rule in enumerate(rules) if rule.match is not None]
+        catch_all_rules = [(rule, i) for i, rule in enumerate(rules) if rule.match is None]
+
+        # Evaluate rule-at-a-time over the documents still undecided, rather
+        # than document-at-a-time over the rules: each pass is a tight loop
+        # over one predicate, and decided documents drop out of later passes
+        results = [self.policy.default == "allow"] * len(documents)
+        pending = list(range(len(documents)))
+
+        for rule, i in explicit_rules:
+            if not pending:
+                break
+            matcher = self._match_predicates.get(i)
+            plan = None
+            unmatched = []
+            for index in pending:
+                document = documents[index]
+                if matcher(document) if matcher is not None else self._document_matches_rule(document, rule):
+                    # First matching explicit rule decides (allow or explicit deny)
+                    if plan is None:
+                        plan = self._user_rule_plan(user, rule.allow, i)
+                    results[index] = self._run_rule_plan(plan, user, document)
+                else:
+                    unmatched.append(index)
+            pending = unmatched
+
+        # No explicit rule matched these, check catch-all rules (which can
+        # only grant, so there's nothing to do under a default allow)
+        for rule, i in catch_all_rules:
+            if not pending or self.policy.default == "allow":
+                break
+            plan = self._user_rule_plan(user, rule.allow, i)
+            if plan is False:
+                continue
+            if plan is True:
+                for index in pending:
+                    results[index] = True
+                break
+            denied = []
+            for index in pending:
+                if plan(user, documents[index]):
+                    results[index] = True
+                else:
+                    denied.append(index)
+            pending = denied
+
+        return results
+
+    def _user_rule_plan(
+        self,
+        user: dict[str, Any],
+        allow: AllowConditions,
+        rule_index: int
+    ) -> Any:
+        """
+        Resolve the document-independent part of a rule for one user.
+
+        Mirrors _user_allowed: returns True or False when the outcome is the
+        same for every document, otherwise the rule's condition predicate.
+        """
+        condition_check_specified = allow.conditions is not None and len(allow.conditions) > 0
+        user_check_specified = allow.everyone is True or (allow.roles is not None and len(allow.roles) > 0)
+
+        if user_check_specified and not self._user_level_allowed(user, allow, rule_index):
+            return False
+        if not condition_check_specified:
+            # Only user checks (already passed) or nothing specified (deny)
+            return user_check_specified
+
+        required = self._required_user_keys.get(rule_index)
+        if required is not None and not (isinstance(user, dict) and user.keys() >= required):
+            return False
+
+        predicate = self._compiled_predicates.get(rule_index)
+        if predicate is not None:
+            return predicate
+
+        # Fallback to string parsing (shouldn't happen if compilation succeeded)
+        conditions = tuple(allow.conditions)
+        return lambda u, d: all(self._evaluate_condition(c, u, d) for c in conditions)
+
+    @staticmethod
+    def _run_rule_plan(plan: Any, user: dict[str, Any], document: dict[str, Any]) -> bool:
+        """Apply a plan from _user_rule_plan to a single document."""
+        if plan is True or plan is False:
+            return plan
+        return plan(user, document)
+
     def evaluate_with_explanation(
         self,
         user: dict[str, Any],
@@ -549,6 +687,14 @@ class PolicyEngine:
 
         return {"allowed": allowed, "details": details}
 
+    def _rule_matches(self, document: dict[str, Any], rule: Rule, rule_index: int) -> bool:
+        """Check a rule's match conditions using its compiled matcher if available."""
+        matcher = self._match_predicates.get(rule_index)
+        if matcher is not None:
+            return matcher(document)
+        # Fallback for rules added after the engine was built
+        return self._document_matches_rule(document, rule)
+
     def _document_matches_rule(self, document: dict[str, Any], rule: Rule) -> bool:
         """
         Check if a document matches a rule's match conditions.
@@ -596,41 +742,14 @@ class PolicyEngine:
         condition_check_passed = False
 
         # Check user access (either everyone flag or roles)
-        user_allowed = False
-
-        # Check "everyone" flag - means all users are allowed
-        if allow.everyone is True:
-            user_allowed = True
-        # Check role-based access using pre-converted role sets
-        elif allow.roles is not None and len(allow.roles) > 0:
-            user_roles = user.get("roles", [])
-            # Handle None roles (treat as empty list)
-            if user_roles is None:
-                user_roles = []
-            elif isinstance(user_roles, str):
-                user_roles = [user_roles]
-
-            # Use pre-converted role set for efficient set intersection
-            if rule_index in self._role_sets:
-                role_set = self._role_sets[rule_index]
-                # Convert user_roles to set and use intersection for O(min(n,m)) performance
-                # This is faster than any() which is O(n*m) in worst case
-                user_allowed = bool(set(user_roles) & role_set)
-            else:
-                # Fallback to list check (shouldn't happen if pre-conversion succeeded)
-                user_allowed = any(role in allow.roles for role in user_roles)
+        user_allowed = self._user_level_allowed(user, allow, rule_index)
 
         # Check custom conditions using compiled conditions/expressions
         if condition_check_specified:
-            # Use compiled conditions if available (performance optimization)
-            if rule_index in self._compiled_conditions:
-                compiled_nodes = self._compiled_conditions[rule_index]
-                condition_check_passed = True
-                for compiled_node in compiled_nodes:
-                    # Use evaluate_node to support both CompiledCondition and CompiledExpression
-                    if not CompiledConditionEvaluator.evaluate_node(compiled_node, user, document):
-                        condition_check_passed = False
-                        break
+            # Use compiled predicates if available (performance optimization)
+            predicate = self._compiled_predicates.get(rule_index)
+            if predicate is not None:
+                condition_check_passed = predicate(user, document)
             else:
                 # Fallback to string parsing (shouldn't happen if compilation succeeded)
                 condition_check_passed = True
@@ -657,6 +776,44 @@ class PolicyEngine:
         # Case 4: Neither specified - deny (no way to grant access)
         return False
 
+    def _user_level_allowed(
+        self,
+        user: dict[str, Any],
+        allow: AllowConditions,
+        rule_index: int
+    ) -> bool:
+        """
+        Check the document-independent part of allow conditions (everyone/roles).
+
+        Args:
+            user: User context
+            allow: Allow conditions from the rule
+            rule_index: Index of the rule (for role set lookup)
+        """
+        # Check "everyone" flag - means all users are allowed
+        if allow.everyone is True:
+            return True
+
+        # Check role-based access using pre-converted role sets
+        if allow.roles is not None and len(allow.roles) > 0:
+            user_roles = user.get("roles", [])
+            # Handle None roles (treat as empty list)
+            if user_roles is None:
+                user_roles = []
+            elif isinstance(user_roles, str):
+                user_roles = [user_roles]
+
+            # Use pre-converted role set for efficient set intersection
+            role_set = self._role_sets.get(rule_index)
+            if role_set is not None:
+                # Convert user_roles to set and use intersection for O(min(n,m)) performance
+                # This is faster than any() which is O(n*m) in worst case
+                return bool(set(user_roles) & role_set)
+            # Fallback to list check (shouldn't happen if pre-conversion succeeded)
+            return any(role in allow.roles for role in user_roles)
+
+        return False
+
     def _evaluate_condition(
         self,
         condition: str,
@@ -836,11 +993,8 @@ class PolicyEngine:
         """
         # Check cache first (if enabled)
         if self._filter_cache is not None:
-            cache_key = CacheKeyBuilder.build_key(
-                backend=backend,
-                policy_hash=self._policy_hash,
-                user=user,
-                relevant_user_fields=self._relevant_user_fields
+            cache_key = CacheKeyBuilder.build_tuple_key(
+                backend, self._policy_hash, user, self._user_key_paths
             )
 
             cached_filter = self._filter_cache.get(cache_key)
@@ -6,9 +6,10 @@ which users can access which documents.
 """
 
 import json
+from json.encoder import encode_basestring_ascii
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from ..types import PolicyDict
 
@@ -48,6 +49,159 @@ class PolicyLimits:
     MAX_EXPRESSION_CONDITIONS = 100
 
 
+class _SizeLimitExceeded(Exception):
+    """Raised internally by _json_size to stop counting early."""
+
+
+def _json_float_size(value: float) -> int:
+    """Length of a float as written by json.dumps."""
+    if value != value:
+        return 3  # NaN
+    if value in (float("inf"), float("-inf")):
+        return 8 if value > 0 else 9  # Infinity / -Infinity
+    return len(float.__repr__(value))
+
+
+# Values _json_size_estimate inspects before assuming the input is large
+_SIZE_ESTIMATE_MAX_VALUES = 10_000
+
+
+def _scalar_size_bound(value: Any, limit: int) -> int:
+    """Upper bound of the json.dumps length of a non-container value."""
+    kind = type(value)
+    if kind is int:
+        return value.bit_length() // 3 + 2  # digits and sign
+    if kind is float:
+        return 24  # longest float repr, e.g. -2.2250738585072014e-308
+    if value is None or kind is bool:
+        return 5
+    # Anything else: leave it to json.dumps (which may reject it)
+    return limit + 1
+
+
+def _json_size_estimate(data: Any, limit: int) -> Optional[int]:
+    """
+    Cheap upper bound of len(json.dumps(data).encode('utf-8')).
+
+    Sums string lengths over at most _SIZE_ESTIMATE_MAX_VALUES values,
+    tracking a lower bound alongside. Returns None when the input may be
+    larger than ``limit``: the lower bound already passed it (the walk stops
+    there) or the budget ran out. Such input is measured with _json_size,
+    which also stops early.
+    """
+    lower = upper = 0
+    budget = _SIZE_ESTIMATE_MAX_VALUES
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str:
+            # ensure_ascii output: 1 byte per ASCII character, at most 12 (a
+            # surrogate pair of \uXXXX escapes) per code point
+            lower += len(value) + 2
+            upper += 12 * len(value) + 2
+        elif kind is dict or kind is list or kind is tuple:
+            budget -= len(value)
+            if budget < 0:
+                return None
+            if kind is dict:
+                lower += 4 * len(value)  # ": " and ", " separators
+                upper += 4 * len(value) + 2
+                for key in value:
+                    if type(key) is str:
+                        lower += len(key) + 2
+                        upper += 12 * len(key) + 2
+                    else:
+                        lower += 3
+                        upper += _scalar_size_bound(key, limit) + 2
+                value = value.values()
+            else:
+                lower += 2 * len(value)
+                upper += 2 * len(value) + 2
+            stack.extend(value)
+        else:
+            lower += 1
+            upper += _scalar_size_bound(value, limit)
+        if lower > limit:
+            return None
+    return upper
+
+
+def _json_size(data: Any, limit: int) -> int:
+    """
+    Compute len(json.dumps(data).encode('utf-8')) without building the string.
+
+    Counting stops as soon as the size exceeds ``limit``, so oversized input
+    is rejected after reading about ``limit`` bytes of it instead of all of
+    it. In that case the partial count (> limit) is returned.
+
+    Only used for input _json_size_estimate flags as possibly oversized;
+    json.dumps is faster for policies of normal size.
+
+    Raises:
+        TypeError: If data is not JSON serializable (as json.dumps would)
+        ValueError: If data contains a circular reference
+    """
+    size = 0
+    active: set[int] = set()
+
+    def add(count: int) -> None:
+        nonlocal size
+        size += count
+        if size > limit:
+            raise _SizeLimitExceeded
+
+    def key_size(key: Any) -> int:
+        if isinstance(key, str):
+            text = key
+        elif isinstance(key, float):
+            return _json_float_size(key) + 2
+        elif key is True or key is False or key is None:
+            text = "true" if key is True else "false" if key is False else "null"
+        elif isinstance(key, int):
+            text = int.__repr__(key)
+        else:
+            raise TypeError(
+                f"keys must be str, int, float, bool or None, not {key.__class__.__name__}"
+            )
+        return len(encode_basestring_ascii(text))
+
+    def walk(value: Any) -> None:
+        # Mirrors the type dispatch order of json.JSONEncoder
+        if isinstance(value, str):
+            add(len(encode_basestring_ascii(value)))  # ensure_ascii output is 1 byte/char
+        elif value is None or value is True:
+            add(4)
+        elif value is False:
+            add(5)
+        elif isinstance(value, int):
+            add(len(int.__repr__(value)))
+        elif isinstance(value, float):
+            add(_json_float_size(value))
+        elif isinstance(value, (list, tuple, dict)):
+            if id(value) in active:
+                raise ValueError("Circular reference detected")
+            active.add(id(value))
+            if isinstance(value, dict):
+                add(2 + 2 * max(len(value) - 1, 0))  # {} and ", " separators
+                for key, item in value.items():
+                    add(key_size(key) + 2)  # key and ": "
+                    walk(item)
+            else:
+                add(2 + 2 * max(len(value) - 1, 0))  # [] and ", " separators
+                for item in value:
+                    walk(item)
+            active.discard(id(value))
+        else:
+            raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+    try:
+        walk(data)
+    except _SizeLimitExceeded:
+        pass
+    return size
+
+
 class AllowConditions(BaseModel):
     """Defines who is allowed access under a rule."""
 
@@ -191,6 +345,10 @@ class Policy(BaseModel):
         description="Default action when no rules match"
     )
 
+    # (condition fingerprint, compiled conditions, compiled predicates)
+    # Filled lazily by _compiled_rules() and shared by every PolicyEngine
+    _compiled_cache: Optional[tuple[Any, ...]] = PrivateAttr(default=None)
+
     @field_validator("version")
     @classmethod
     def validate_version(cls, v: str) -> str:
@@ -245,13 +403,24 @@ class Policy(BaseModel):
             ValueError: If policy is too large
             PolicyValidationError: If validate=True and policy has errors
         """
-        # Check policy size limit
-        policy_json = json.dumps(data)
-        policy_size = len(policy_json.encode('utf-8'))
+        # Check policy size limit (as serialized JSON). Input that may be
+        # oversized is counted with early exit instead of being serialized in
+        # full, so the count stops just past the limit. Input whose worst-case
+        # size fits needs no serializing at all.
+        size_bound = _json_size_estimate(data, PolicyLimits.MAX_POLICY_SIZE_BYTES)
+        size_prefix = ""
+        if size_bound is None:
+            policy_size = _json_size(data, PolicyLimits.MAX_POLICY_SIZE_BYTES)
+            size_prefix = "at least "
+        elif size_bound > PolicyLimits.MAX_POLICY_SIZE_BYTES:
+            policy_size = len(json.dumps(data).encode('utf-8'))
+        else:
+            policy_size = size_bound
 
         if policy_size > PolicyLimits.MAX_POLICY_SIZE_BYTES:
             raise ValueError(
-                f"Policy too large: {policy_size} bytes > {PolicyLimits.MAX_POLICY_SIZE_BYTES} bytes. "
+                f"Policy too large: {size_prefix}{policy_size} bytes > "
+                f"{PolicyLimits.MAX_POLICY_SIZE_BYTES} bytes. "
                 f"This could cause performance issues or DoS attacks."
             )
 
@@ -268,3 +437,55 @@ class Policy(BaseModel):
                 print_validation_issues(issues)
 
         return policy
+
+    def _compiled_rules(self) -> tuple[dict[int, list[Any]], dict[int, Any]]:
+        """
+        Compile every rule's conditions, reusing the result across engines.
+
+        The cache is keyed by the condition strings themselves, so it is
+        rebuilt automatically if the rules are modified after loading.
+
+        Returns:
+            Tuple of (rule_index -> list of CompiledCondition/CompiledExpression,
+            rule_index -> fused predicate(user, document))
+
+        Raises:
+            ConditionCompilationError: If a condition cannot be compiled
+        """
+        fingerprint = tuple(
+            tuple(rule.allow.conditions) if rule.allow.conditions else ()
+            for rule in self.rules
+        )
+        cached = self._compiled_cache
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1], cached[2]
+
+        # Import here to avoid circular dependency
+        from ..exceptions import ConditionCompilationError
+        from .compiler import ConditionCompiler, PredicateCompiler
+
+        compiled_conditions: dict[int, list[Any]] = {}
+        for i, rule in enumerate(self.rules):
+            if rule.allow.conditions:
+                compiled = []
+                for condition_str in rule.allow.conditions:
+                    try:
+                        # Use compile_expression to support OR/AND logic
+                        compiled.append(ConditionCompiler.compile_expression(condition_str))
+                    except (ValueError, TypeError, RecursionError) as e:
+                        # Catch specific parsing/compilation errors
+                        raise ConditionCompilationError(
+                            condition=condition_str,
+                            rule_name=rule.name,
+                            reason=str(e),
+                            cause=e
+                        )
+                compiled_conditions[i] = compiled
+
+        compiled_predicates = {
+            i: PredicateCompiler.compile_conjunction(compiled)
+            for i, compiled in compiled_conditions.items()
+        }
+
+        self._compiled_cache = (fingerprint, compiled_conditions, compiled_predicates)
+        return compiled_conditions, compiled_predicates
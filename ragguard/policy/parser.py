@@ -1,9 +1,10 @@
 """
-Policy parser for loading and validating YAML policy files.
+Policy parser for loading and validating YAML and JSON policy files.
 """
 
+import json
 from pathlib import Path
-from typing import Union
+from typing import Any, Union
 
 import yaml
 from pydantic import ValidationError
@@ -12,6 +13,34 @@ from ..exceptions import PolicyError, PolicyValidationError
 from ..types import PolicyDict
 from .models import Policy
 
+# orjson is an optional speedup for JSON policies; fall back to stdlib json
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# File extensions loaded as JSON rather than YAML
+_JSON_SUFFIXES = (".json",)
+
+
+def _safe_load_yaml(stream: Any) -> Any:
+    """
+    Parse YAML with the safe loader.
+
+    Uses libyaml's C loader when PyYAML was built with it (same safe
+    semantics, much faster than the pure-Python SafeLoader).
+    """
+    if hasattr(yaml, "CSafeLoader"):
+        return yaml.load(stream, Loader=yaml.CSafeLoader)
+    return yaml.safe_load(stream)
+
+
+def _decode_json(data: Union[str, bytes]) -> PolicyDict:
+    """Decode JSON using orjson if available, otherwise the json module."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class PolicyParser:
     """Parses and validates RAGGuard policy definitions."""
@@ -19,10 +48,13 @@ class PolicyParser:
     @staticmethod
     def from_file(path: Union[str, Path], validate: bool = True) -> Policy:
         """
-        Load a policy from a YAML file.
+        Load a policy from a YAML or JSON file.
+
+        Files ending in ``.json`` are parsed as JSON (much faster to load
+        than YAML); anything else is parsed as YAML.
 
         Args:
-            path: Path to the YAML policy file
+            path: Path to the YAML or JSON policy file
             validate: If True, runs semantic validation (default: True)
 
         Returns:
@@ -37,9 +69,16 @@ class PolicyParser:
         if not path.exists():
             raise PolicyError(f"Policy file not found: {path}")
 
+        if path.suffix.lower() in _JSON_SUFFIXES:
+            try:
+                raw = path.read_bytes()
+            except Exception as e:
+                raise PolicyError(f"Failed to read policy file: {e}")
+            return PolicyParser.from_json_string(raw, validate=validate)
+
         try:
             with open(path) as f:
-                data = yaml.safe_load(f)
+                data = _safe_load_yaml(f)
         except yaml.YAMLError as e:
             raise PolicyError(f"Failed to parse YAML: {e}")
         except Exception as e:
@@ -101,7 +140,7 @@ class PolicyParser:
             PolicyValidationError: If policy structure is invalid
         """
         try:
-            data = yaml.safe_load(yaml_string)
+            data = _safe_load_yaml(yaml_string)
         except yaml.YAMLError as e:
             raise PolicyError(f"Failed to parse YAML: {e}")
 
@@ -110,16 +149,45 @@ class PolicyParser:
 
         return PolicyParser.from_dict(data, validate=validate)
 
+    @staticmethod
+    def from_json_string(json_data: Union[str, bytes], validate: bool = True) -> Policy:
+        """
+        Parse a policy from a JSON string or bytes.
+
+        Uses orjson when installed, otherwise the standard json module.
+
+        Args:
+            json_data: JSON-encoded policy
+            validate: If True, runs semantic validation (default: True)
+
+        Returns:
+            Validated Policy object
+
+        Raises:
+            PolicyError: If JSON cannot be parsed or is not an object
+            PolicyValidationError: If policy structure is invalid
+        """
+        try:
+            data = _decode_json(json_data)
+        except ValueError as e:
+            # json.JSONDecodeError and orjson.JSONDecodeError subclass ValueError
+            raise PolicyError(f"Failed to parse JSON: {e}")
+
+        if not isinstance(data, dict):
+            raise PolicyError("Policy JSON must be an object")
+
+        return PolicyParser.from_dict(data, validate=validate)
+
 
 # Convenience function for common use case
 def load_policy(path: Union[str, Path], validate: bool = True) -> Policy:
     """
-    Load a policy from a YAML file.
+    Load a policy from a YAML or JSON file.
 
     This is a convenience function that wraps PolicyParser.from_file.
 
     Args:
-        path: Path to the YAML policy file
+        path: Path to the YAML or JSON (``.json``) policy file
         validate: If True, runs semantic validation (default: True)
 
     Returns:
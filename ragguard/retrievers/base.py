@@ -703,8 +703,8 @@ class BaseSecureRetriever(ABC):
             )
             raise RetrieverError(f"Failed to build permission filter: {e}")
 
-        # Execute searches with the pre-built filter
-        all_results = []
+        # Embed every query up front so the backend can run them in one call
+        query_vectors = []
         for i, query in enumerate(queries):
             try:
                 # Convert text query to embedding if needed
@@ -714,36 +714,75 @@ class BaseSecureRetriever(ABC):
                             "Query is a string but no embed_fn was provided. "
                             "Either provide embed_fn or pass embeddings directly."
                         )
-                    query_vector = self.embed_fn(query)
+                    query_vectors.append(self.embed_fn(query))
                 else:
-                    query_vector = query
+                    query_vectors.append(query)
+            except Exception as e:
+                self._log_batch_query_failure(i, e)
+                raise
+
+        # Execute searches with the pre-built filter
+        # This bypasses the full search() overhead
+        return self._execute_batch_search(
+            queries=query_vectors,
+            filter=native_filter,
+            limit=limit,
+            **kwargs
+        )
+
+    def _execute_batch_search(
+        self,
+        queries: list[EmbeddingVector],
+        filter: FilterType,
+        limit: int,
+        **kwargs
+    ) -> list[list[Any]]:
+        """
+        Execute several searches that share one permission filter.
+
+        The default runs _execute_search once per query. Backends with a
+        native multi-query API override this to send the whole batch in a
+        single request.
 
-                # Execute the underlying search with pre-built filter
-                # This bypasses the full search() overhead
+        Args:
+            queries: Query embedding vectors
+            filter: Backend-specific filter object, shared by every query
+            limit: Maximum results per query
+            **kwargs: Additional backend-specific arguments
+
+        Returns:
+            List of result lists - one list per query
+        """
+        all_results = []
+        for i, query_vector in enumerate(queries):
+            try:
                 results = self._execute_search(
                     query=query_vector,
-                    filter=native_filter,
+                    filter=filter,
                     limit=limit,
                     **kwargs
                 )
                 all_results.append(results)
-
             except Exception as e:
-                logger.warning(
-                    f"Batch search query {i} failed",
-                    extra={
-                        "extra_fields": {
-                            "backend": self.backend_name,
-                            "query_index": i,
-                            "error": str(e)
-                        }
-                    }
-                )
+                self._log_batch_query_failure(i, e)
                 # Re-raise to fail the batch (consistent with single search behavior)
                 raise
 
         return all_results
 
+    def _log_batch_query_failure(self, index: int, error: Exception) -> None:
+        """Log a failed query of a batch search."""
+        logger.warning(
+            f"Batch search query {index} failed",
+            extra={
+                "extra_fields": {
+                    "backend": self.backend_name,
+                    "query_index": index,
+                    "error": str(error)
+                }
+            }
+        )
+
     def invalidate_filter_cache(self) -> None:
         """
         Clear the filter cache.
@@ -250,6 +250,8 @@ class FAISSSecureRetriever(BaseSecureRetriever):
                 if indices is None or len(indices) == 0 or len(indices[0]) == 0:
                     break  # No more results possible
 
+                # Collect new candidates from this iteration
+                candidates = []
                 for i, idx in enumerate(indices[0]):
                     if idx == -1:  # FAISS returns -1 for padding
                         continue
@@ -262,11 +264,17 @@ class FAISSSecureRetriever(BaseSecureRetriever):
                     if idx >= len(self.metadata):
                         continue  # Skip if metadata missing
 
-                    doc_metadata = self.metadata[idx]
+                    candidates.append((i, idx, self.metadata[idx]))
+
+                # Check permissions for the whole batch using policy engine
+                allowed = self.policy_engine.evaluate_batch(
+                    user, [doc_metadata for _, _, doc_metadata in candidates]
+                )
+
+                for (i, idx, doc_metadata), is_allowed in zip(candidates, allowed):
                     total_documents_checked += 1
 
-                    # Check permissions using policy engine
-                    if self.policy_engine.evaluate(user, doc_metadata):
+                    if is_allowed:
                         result = {
                             "id": doc_metadata.get("id", idx),
                             "metadata": doc_metadata,
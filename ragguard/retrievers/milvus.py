@@ -355,7 +355,7 @@ class MilvusSecureRetriever(BaseSecureRetriever):
         Returns:
             Filtered results as normalized dicts
         """
-        filtered = []
+        candidates = []
 
         for hit in hits:
             # Extract metadata from hit
@@ -375,8 +375,16 @@ class MilvusSecureRetriever(BaseSecureRetriever):
                 doc_id = getattr(hit, 'id', None)
                 distance = getattr(hit, 'distance', 0.0)
 
-            # Evaluate policy using the shared policy engine
-            if self.policy_engine.evaluate(user, metadata):
+            candidates.append((doc_id, metadata, distance))
+
+        # Evaluate policy for all hits at once using the shared policy engine
+        allowed = self.policy_engine.evaluate_batch(
+            user, [metadata for _, metadata, _ in candidates]
+        )
+
+        filtered = []
+        for (doc_id, metadata, distance), is_allowed in zip(candidates, allowed):
+            if is_allowed:
                 filtered.append({
                     "id": doc_id,
                     "metadata": metadata,
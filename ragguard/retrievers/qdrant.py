@@ -16,6 +16,23 @@ from .base import BaseSecureRetriever
 if TYPE_CHECKING:
     from ..config import SecureRetrieverConfig
 
+# query_points keyword arguments that have a per-query QueryRequest field,
+# mapped to that field's name
+_QUERY_REQUEST_FIELDS = {
+    'using': 'using',
+    'prefetch': 'prefetch',
+    'search_params': 'params',
+    'score_threshold': 'score_threshold',
+    'offset': 'offset',
+    'with_payload': 'with_payload',
+    'with_vectors': 'with_vector',
+    'lookup_from': 'lookup_from',
+    'shard_key_selector': 'shard_key',
+}
+
+# query_points keyword arguments that query_batch_points takes for the batch
+_BATCH_REQUEST_ARGS = frozenset({'consistency', 'timeout'})
+
 
 class QdrantSecureRetriever(BaseSecureRetriever):
     """
@@ -165,6 +182,65 @@ class QdrantSecureRetriever(BaseSecureRetriever):
         except Exception as e:
             raise RetrieverError(f"Qdrant search failed: {e}")
 
+    def _execute_batch_search(
+        self,
+        queries: list[list[float]],
+        filter: Any,
+        limit: int,
+        **kwargs
+    ) -> list[list[Any]]:
+        """
+        Execute all queries of a batch search in one Qdrant request.
+
+        Uses query_batch_points so N queries cost one round-trip instead of
+        N. Clients without it fall back to one search per query.
+
+        Args:
+            queries: Query embedding vectors
+            filter: Qdrant Filter object, shared by every query
+            limit: Maximum results per query
+            **kwargs: Additional Qdrant arguments, named as for search();
+                per-query ones are renamed to their QueryRequest fields.
+                Arguments with no batch equivalent fall back to one search
+                per query, so batch_search accepts whatever search() does.
+
+        Returns:
+            List of ScoredPoint lists - one list per query
+        """
+        # Pop internal kwargs that shouldn't be passed to client
+        kwargs.pop('_user', None)
+        kwargs.pop('_search_stats', None)
+
+        if not hasattr(self.client, 'query_batch_points') or any(
+            key not in _QUERY_REQUEST_FIELDS and key not in _BATCH_REQUEST_ARGS
+            for key in kwargs
+        ):
+            return super()._execute_batch_search(queries, filter, limit, **kwargs)
+
+        try:
+            from qdrant_client.models import QueryRequest
+
+            request_kwargs = {
+                _QUERY_REQUEST_FIELDS[key]: kwargs.pop(key)
+                for key in list(kwargs) if key in _QUERY_REQUEST_FIELDS
+            }
+            # query_points returns payloads by default; batch requests do not
+            request_kwargs.setdefault('with_payload', True)
+            responses = self.client.query_batch_points(
+                collection_name=self.collection,
+                requests=[
+                    QueryRequest(query=query, filter=filter, limit=limit, **request_kwargs)
+                    for query in queries
+                ],
+                **kwargs
+            )
+            return [response.points for response in responses]
+        except (ConnectionError, TimeoutError, OSError):
+            # Let retryable exceptions pass through for retry decorator
+            raise
+        except Exception as e:
+            raise RetrieverError(f"Qdrant batch search failed: {e}")
+
     def _check_backend_health(self) -> dict[str, Any]:
         """
         Check Qdrant backend health.
@@ -16,6 +16,9 @@ from .constants import (
     USER_PREFIX_LEN,
 )
 
+# Sentinel for "key not present" (None is a valid stored value)
+_MISSING = object()
+
 
 def strip_user_prefix(field: str) -> str:
     """
@@ -130,9 +133,9 @@ def get_nested_value(
 
     for part in parts:
         if isinstance(current, dict):
-            if part in current:
-                current = current[part]
-            else:
+            # One probe instead of `in` + lookup
+            current = current.get(part, _MISSING)
+            if current is _MISSING:
                 return default
         else:
             return default
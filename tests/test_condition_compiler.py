@@ -8,6 +8,8 @@ Verifies that:
 - Edge cases are handled correctly
 """
 
+import sys
+
 import pytest
 
 from ragguard.policy import Policy, PolicyEngine
@@ -166,6 +168,104 @@ def test_compile_invalid_operator():
         ConditionCompiler.compile_condition("user.x % document.y")
 
 
+def test_compile_expression_is_memoized():
+    """Repeated compiles of one condition (e.g. once per backend) share a parse."""
+    from ragguard.policy.compiler.condition_compiler import _compile_expression_cached
+
+    condition = "(document.status == 'active' OR user.role == 'admin')"
+    first = ConditionCompiler.compile_expression(condition)
+    hits = _compile_expression_cached.cache_info().hits
+
+    second = ConditionCompiler.compile_expression(f"  {condition} ")
+    assert _compile_expression_cached.cache_info().hits == hits + 1
+    assert second == first
+    assert second is not first
+
+
+def test_compile_expression_returns_unshared_trees():
+    """Changing one compiled tree doesn't change what later compiles return."""
+    condition = "(document.category in ['cs.AI', 'cs.LG'] OR user.role == 'admin')"
+
+    first = ConditionCompiler.compile_expression(condition)
+    first.children[0].right.value.append("cs.SECRET")
+    first.children[1].operator = ConditionOperator.NOT_EQUALS
+
+    second = ConditionCompiler.compile_expression(condition)
+    assert second.children[0].right.value == ["cs.AI", "cs.LG"]
+    assert second.children[1].operator == ConditionOperator.EQUALS
+
+
+def test_backend_filter_changes_dont_leak_into_other_policies():
+    """Changing an emitted filter doesn't widen access for a freshly parsed policy."""
+    from ragguard.filters.backends.elasticsearch import to_elasticsearch_filter
+
+    policy_dict = {
+        "version": "1",
+        "rules": [{
+            "name": "categories",
+            "allow": {"conditions": ["document.category in ['cs.AI', 'cs.LG']"]},
+        }],
+        "default": "deny",
+    }
+
+    emitted = to_elasticsearch_filter(Policy.from_dict(policy_dict), {})
+    emitted["terms"]["category"].append("cs.SECRET")
+
+    policy = Policy.from_dict(policy_dict)
+    assert to_elasticsearch_filter(policy, {})["terms"]["category"] == ["cs.AI", "cs.LG"]
+    assert PolicyEngine(policy).evaluate({}, {"category": "cs.SECRET"}) is False
+
+
+def test_compile_condition_is_memoized():
+    """Rule validation and the policy engine share one parse per condition."""
+    from ragguard.policy.compiler.condition_compiler import _compile_condition_cached
+
+    condition = "document.status == 'active'"
+    first = ConditionCompiler.compile_condition(condition)
+    hits = _compile_condition_cached.cache_info().hits
+
+    second = ConditionCompiler.compile_condition(f" {condition}")
+    assert _compile_condition_cached.cache_info().hits == hits + 1
+    assert second == first
+    assert second is not first
+    assert ConditionCompiler.compile_expression(condition) == first
+
+
+def test_compile_condition_returns_unshared_nodes():
+    """Changing a compiled condition doesn't change later compiles or policies."""
+    condition = "document.category in ['cs.AI', 'cs.LG']"
+
+    first = ConditionCompiler.compile_condition(condition)
+    first.right.value.append("cs.SECRET")
+    first.operator = ConditionOperator.NOT_IN
+
+    second = ConditionCompiler.compile_condition(condition)
+    assert second.operator == ConditionOperator.IN
+    assert second.right.value == ["cs.AI", "cs.LG"]
+
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [{"name": "categories", "allow": {"conditions": [condition]}}],
+        "default": "deny",
+    })
+    assert PolicyEngine(policy).evaluate({}, {"category": "cs.SECRET"}) is False
+
+
+def test_compile_interns_field_path_segments():
+    """Equal field names from different conditions are the same object."""
+    first = ConditionCompiler.compile_condition("document.team_" + "name == 'a'")
+    second = ConditionCompiler.compile_condition("user.team_" + "name == document.owner")
+
+    assert first.left.field_path[0] is second.left.field_path[0]
+
+
+def test_compile_expression_errors_are_not_cached():
+    """Invalid conditions raise on every call."""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            ConditionCompiler.compile_expression("user.x ~= document.y")
+
+
 # ============================================================================
 # Evaluator Unit Tests
 # ============================================================================
@@ -531,5 +631,21 @@ def test_compiled_conditions_are_faster():
     assert compiled_time < 0.1  # Should complete 1000 iterations in < 100ms
 
 
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+def test_compiled_nodes_use_slots():
+    """Compiled nodes are slotted and carry no per-instance __dict__."""
+    expression = ConditionCompiler.compile_expression(
+        "(user.role == 'admin' OR document.status == 'public')"
+    )
+    condition = expression.children[0]
+
+    for node in (expression, condition, condition.left, condition.right):
+        assert not hasattr(node, "__dict__")
+
+    # Nodes stay mutable
+    condition.operator = ConditionOperator.NOT_EQUALS
+    assert condition.operator == ConditionOperator.NOT_EQUALS
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,170 @@
+"""
+Tests for boolean optimization of compiled condition trees.
+
+Optimized rules must give exactly the same decisions as the unoptimized
+trees evaluated by CompiledConditionEvaluator.
+"""
+
+import pytest
+
+from ragguard.policy.compiler import (
+    CompiledCondition,
+    CompiledConditionEvaluator,
+    CompiledExpression,
+    ConditionCompiler,
+    ConditionOperator,
+    ConditionOptimizer,
+    LogicalOperator,
+    PredicateCompiler,
+    ValueType,
+)
+
+
+def optimize(condition):
+    return ConditionOptimizer.optimize(ConditionCompiler.compile_expression(condition))
+
+
+CONDITIONS = [
+    "(document.status == 'active' OR document.status == 'review')",
+    "(document.status == 'active' OR 'review' == document.status OR document.owner == user.id)",
+    "(document.category in ['cs.AI', 'cs.LG'] OR document.category == 'cs.DB')",
+    "(user.role == 'admin' OR user.role == 'manager' OR document.public == true)",
+    "(document.level == 1 OR document.level == true OR document.level == '1')",
+    "(document.status == 'active' OR document.status == 'active')",
+    "((document.a == 'x' OR document.a == 'y') AND (document.b == 'z' AND document.c exists))",
+    "(1 > 2 OR document.status == 'active')",
+    "(1 < 2 AND document.status == 'active')",
+    "('a' in ['a', 'b'] OR document.status == 'active')",
+    "(document.status == 'x' OR document.metadata.team == 'core' OR document.metadata.team == 'edge')",
+    "(document.status == 'active' AND document.status != 'archived' AND document.owner exists)",
+    "(document.status == 'active' AND 'active' != document.status)",
+    "(document.status == 'active' AND document.status in ['active', 'review'])",
+    "(document.status == 'active' AND document.status not in ['draft', 'review'])",
+    "(document.status == 'active' AND 'active' == document.status AND document.level == 1)",
+    "(user.role == 'admin' AND user.role == 'viewer')",
+]
+
+USERS = [{}, {"id": "alice", "role": "admin"}, {"id": "bob", "role": "viewer"}]
+
+DOCUMENTS = [
+    {},
+    {"status": "active", "owner": "alice", "category": "cs.DB", "level": 1},
+    {"status": "review", "category": "cs.AI", "level": True, "public": True},
+    {"status": "archived", "owner": "bob", "level": "1", "a": "y", "b": "z", "c": 0},
+    {"status": ["active"], "level": 1.0, "a": "x", "b": "z", "metadata": {"team": "edge"}},
+    {"status": None, "category": None, "level": 2, "metadata": {"team": "core"}},
+]
+
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_optimized_rules_match_evaluator(condition):
+    """Optimized predicates decide exactly as the original tree does."""
+    node = ConditionCompiler.compile_expression(condition)
+    predicate = PredicateCompiler.compile_conjunction([node])
+
+    for user in USERS:
+        for document in DOCUMENTS:
+            expected = CompiledConditionEvaluator.evaluate_node(node, user, document)
+            assert predicate(user, document) is expected, (condition, user, document)
+
+
+def test_equality_chain_becomes_membership():
+    """OR'ed equalities on one field collapse into a single list test."""
+    result = optimize(
+        "(document.status == 'active' OR 'review' == document.status "
+        "OR document.status in ['draft', 'active'])"
+    )
+
+    assert isinstance(result, CompiledCondition)
+    assert result.operator == ConditionOperator.IN
+    assert result.left.field_path == ("status",)
+    assert result.right.value_type == ValueType.LITERAL_LIST
+    assert result.right.value == ["active", "review", "draft"]
+
+
+def test_membership_merge_keeps_other_branches():
+    """Only same-field equality branches are merged."""
+    result = optimize(
+        "(document.status == 'active' OR user.role == 'admin' OR document.status == 'review')"
+    )
+
+    assert isinstance(result, CompiledExpression)
+    assert result.operator == LogicalOperator.OR
+    assert len(result.children) == 2
+    assert result.children[0].right.value == ["active", "review"]
+    assert result.children[1].left.field_path == ("role",)
+
+
+def test_membership_merge_distinguishes_types():
+    """1, True and '1' stay separate items (1 == True in Python)."""
+    result = optimize("(document.level == 1 OR document.level == true OR document.level == '1')")
+    assert result.right.value == [1, True, "1"]
+
+
+def test_not_equals_chain_is_not_merged():
+    """!= denies on missing fields, unlike not in, so it is left alone."""
+    result = optimize("(document.status != 'a' AND document.status != 'b')")
+
+    assert isinstance(result, CompiledExpression)
+    assert all(child.operator == ConditionOperator.NOT_EQUALS for child in result.children)
+
+
+def test_constant_conditions_fold():
+    """Conditions between literals are decided at compile time."""
+    assert optimize("1 > 2") is False
+    assert optimize("'a' in ['a', 'b']") is True
+    assert optimize("(1 > 2 OR 2 > 1)") is True
+    assert optimize("(1 > 2 AND document.status == 'active')") is False
+
+    result = optimize("(1 < 2 AND document.status == 'active')")
+    assert isinstance(result, CompiledCondition)
+    assert result.left.field_path == ("status",)
+
+
+def test_duplicates_removed_and_nesting_flattened():
+    """A OR A -> A, and nested ANDs are lifted into their parent."""
+    result = optimize("(document.a exists OR document.a exists)")
+    assert isinstance(result, CompiledCondition)
+    assert result.operator == ConditionOperator.EXISTS
+
+    result = optimize("((document.a exists AND document.b exists) AND document.c exists)")
+    assert isinstance(result, CompiledExpression)
+    assert len(result.children) == 3
+
+
+def test_constant_rule_compiles_to_constant_predicate():
+    """A rule whose conditions fold away needs no evaluation at all."""
+    always = PredicateCompiler.compile_conjunction([ConditionCompiler.compile_expression("2 > 1")])
+    never = PredicateCompiler.compile_conjunction([
+        ConditionCompiler.compile_expression("document.status == 'active'"),
+        ConditionCompiler.compile_expression("1 > 2"),
+    ])
+
+    assert always({}, {}) is True
+    assert never({}, {"status": "active"}) is False
+
+
+def test_equality_decides_other_string_tests_on_field():
+    """Under f == 'a', implied tests on f are dropped and contradictions fold."""
+    result = optimize(
+        "(document.status == 'active' AND document.status != 'archived' "
+        "AND document.status in ['active', 'review'] AND document.status not in ['draft'] "
+        "AND document.owner exists)"
+    )
+    assert isinstance(result, CompiledExpression)
+    assert [child.operator for child in result.children] == [
+        ConditionOperator.EQUALS, ConditionOperator.EXISTS
+    ]
+
+    assert optimize("(document.status == 'active' AND document.status == 'draft')") is False
+    assert optimize("(document.status == 'active' AND document.status != 'active')") is False
+    assert optimize("(document.status == 'active' AND document.status not in ['active'])") is False
+
+
+def test_equality_pruning_ignores_other_fields_and_types():
+    """Only string tests on the pinned field are touched."""
+    result = optimize(
+        "(document.status == 'active' AND document.state != 'archived' AND document.status != 1)"
+    )
+    assert isinstance(result, CompiledExpression)
+    assert len(result.children) == 3
@@ -368,3 +368,50 @@ def test_faiss_retriever_max_absolute_fetch_clamp(sample_policy, mock_index, sam
         )
 
         assert retriever.max_absolute_fetch == 1
+
+
+def test_faiss_retriever_non_list_roles(mock_index):
+    """A user with non-list roles gets the same decisions as PolicyEngine.evaluate.
+
+    FAISS has no native filter, so nothing validates roles before the
+    post-filter; rules no candidate reaches must not inspect them.
+    """
+    from ragguard.policy.engine import PolicyEngine
+    from ragguard.policy.models import Policy
+
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "untagged",
+                "allow": {"conditions": ["'b' not in document.tags"]}
+            },
+            {
+                "name": "reviewers",
+                "match": {"category": ["b", "c"]},
+                "allow": {"roles": ["x"]}
+            }
+        ],
+        "default": "allow"
+    })
+    metadata = [
+        {"id": 0, "category": "zzz"},
+        {"id": 1, "tags": ["a"]},
+        {"id": 2, "tags": ["b"]},
+    ]
+    mock_index.search.return_value = (np.array([[0.1, 0.2, 0.3]]), np.array([[0, 1, 2]]))
+    user = {"id": "u", "roles": 1}
+
+    with patch.dict('sys.modules', {'faiss': Mock()}):
+        retriever = FAISSSecureRetriever(
+            index=mock_index,
+            metadata=metadata,
+            policy=policy
+        )
+
+        results = retriever.search(query=[0.1, 0.2, 0.3], user=user, limit=3)
+
+    engine = PolicyEngine(policy)
+    expected = [doc["id"] for doc in metadata if engine.evaluate(user, doc)]
+    assert [r["metadata"]["id"] for r in results] == expected
+    assert expected == [0, 1, 2]
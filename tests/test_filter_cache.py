@@ -314,6 +314,46 @@ def test_cache_key_builder_nested_fields():
     assert len(key) > 0
 
 
+def test_tuple_key_matches_build_key_semantics():
+    """Tuple keys are relevant-field-only, order-insensitive and type-aware."""
+    paths = CacheKeyBuilder.compile_fields({"roles", "metadata.team", "level"})
+
+    def key(user, backend="qdrant", policy_hash="policy123"):
+        return CacheKeyBuilder.build_tuple_key(backend, policy_hash, user, paths)
+
+    base = {"id": "u1", "roles": ["admin", "user"], "metadata": {"team": "core"}, "level": 1}
+
+    assert key(base) == key(dict(base, id="u2", roles=["user", "admin"]))
+    assert key(base) != key(base, backend="pgvector")
+    assert key(base) != key(base, policy_hash="policy456")
+    assert key(base) != key(dict(base, metadata={"team": "edge"}))
+    assert key(base) != key(dict(base, roles=["admin", 123]))
+    assert key(dict(base, roles=["admin", 123])) != key(dict(base, roles=["admin", "123"]))
+    # 1 == 1.0 == True in Python, but they must not share a cached filter
+    assert len({key(dict(base, level=v)) for v in (1, 1.0, True, "1")}) == 4
+    # Missing and None are treated alike, as in build_key
+    assert key({"roles": ["admin"]}) == key({"roles": ["admin"], "metadata": None, "level": None})
+    # Unhashable values still produce a usable key
+    hash(key(dict(base, level={"tier": [1, 2]})))
+
+
+def test_policy_engine_uses_tuple_keys():
+    """PolicyEngine caches filters under collision-free tuple keys."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {"name": "dept", "allow": {"conditions": ["user.department == document.department"]}}
+        ],
+        "default": "deny"
+    })
+    engine = PolicyEngine(policy, enable_filter_cache=True)
+
+    filter1 = engine.to_filter({"id": "a", "department": "eng"}, "qdrant")
+    assert engine.to_filter({"id": "a", "department": "eng", "email": "x"}, "qdrant") is filter1
+    assert engine.to_filter({"id": "a", "department": "sales"}, "qdrant") is not filter1
+    assert all(isinstance(k, tuple) for k in engine._filter_cache._cache)
+
+
 # ============================================================================
 # Policy Hash Tests
 # ============================================================================
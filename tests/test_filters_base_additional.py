@@ -37,6 +37,25 @@ class TestParseListLiteralAdvanced:
         except (ValueError, SyntaxError):
             pass  # Expected
 
+    def test_parse_list_returns_fresh_list(self):
+        """Test that memoized results can't be modified through a returned list."""
+        from ragguard.filters.base import parse_list_literal
+
+        first = parse_list_literal("['cs.AI', 'cs.LG']")
+        first.append("mutated")
+
+        second = parse_list_literal("  ['cs.AI', 'cs.LG']  ")
+        assert second == ['cs.AI', 'cs.LG']
+        assert second is not first
+
+    def test_parse_list_malformed_raises_every_time(self):
+        """Test that errors are raised on every call, not cached away."""
+        from ragguard.filters.base import parse_list_literal
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="missing closing bracket"):
+                parse_list_literal("['a', 'b'")
+
 
 class TestParseLiteralValueAdvanced:
     """Additional tests for parse_literal_value."""
@@ -348,5 +348,60 @@ def test_milvus_filter_or_logic():
     assert " or " in filter_expr.lower()
 
 
+def test_milvus_search_non_list_roles(monkeypatch):
+    """Non-list roles get the same decisions as PolicyEngine.evaluate, or a clear error."""
+    from ragguard import Policy
+    from ragguard.exceptions import RetrieverError
+    from ragguard.policy.engine import PolicyEngine
+    from ragguard.retrievers import MilvusSecureRetriever
+
+    # Patch the module the class actually uses: test_milvus_missing_pymilvus
+    # re-imports ragguard.retrievers.milvus, so patching by path can miss it
+    monkeypatch.setitem(MilvusSecureRetriever.__init__.__globals__, "MilvusClient", MagicMock())
+
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "untagged",
+                "allow": {"conditions": ["'b' not in document.tags"]}
+            },
+            {
+                "name": "reviewers",
+                "match": {"category": ["b", "c"]},
+                "allow": {"roles": ["x"]}
+            }
+        ],
+        "default": "deny"
+    })
+    hits = [
+        {"id": 1, "distance": 0.1, "category": "zzz"},
+        {"id": 2, "distance": 0.2, "category": "b"},
+        {"id": 3, "distance": 0.3, "tags": ["a"]},
+    ]
+    mock_client = MagicMock()
+    mock_client.describe_collection.return_value = {"name": "test_collection"}
+    mock_client.search.return_value = [hits]
+
+    retriever = MilvusSecureRetriever(
+        client=mock_client,
+        collection_name="test_collection",
+        policy=policy
+    )
+    engine = PolicyEngine(policy)
+
+    # A single role given as a string
+    user = {"id": "u", "roles": "x"}
+    results = retriever.search(query=[0.1, 0.2, 0.3], user=user, limit=10)
+
+    expected = [hit["id"] for hit in hits if engine.evaluate(user, hit)]
+    assert [r["id"] for r in results] == expected
+    assert expected == [2, 3]
+
+    # Roles of any other type are rejected while building the Milvus filter
+    with pytest.raises(RetrieverError, match="Invalid user.roles type"):
+        retriever.search(query=[0.1, 0.2, 0.3], user={"id": "u", "roles": 1}, limit=10)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
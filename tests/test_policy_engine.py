@@ -293,3 +293,229 @@ def test_evaluate_combined_roles_and_conditions():
         "department": "engineering"
     }
     assert engine.evaluate(employee, doc) is False
+
+
+def test_evaluate_batch_matches_evaluate():
+    """evaluate_batch returns the same decisions as evaluate, in order."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "public",
+                "match": {"visibility": "public"},
+                "allow": {"everyone": True},
+            },
+            {
+                "name": "confidential",
+                "match": {"visibility": "confidential"},
+                "allow": {
+                    "roles": ["manager"],
+                    "conditions": ["user.department == document.department"]
+                },
+            },
+            {
+                "name": "shared",
+                "allow": {"conditions": ["user.id in document.shared_with"]},
+            },
+            {
+                "name": "admins",
+                "allow": {"roles": ["admin"]},
+            },
+        ],
+        "default": "deny",
+    })
+
+    engine = PolicyEngine(policy)
+
+    users = [
+        {},
+        {"id": "alice", "roles": ["manager"], "department": "engineering"},
+        {"id": "bob", "roles": "admin", "department": "finance"},
+        {"id": "carol", "roles": None},
+    ]
+    docs = [
+        {},
+        {"visibility": "public"},
+        {"visibility": "confidential", "department": "engineering"},
+        {"visibility": "confidential", "department": "finance", "shared_with": ["bob"]},
+        {"visibility": "internal", "shared_with": ["alice", "carol"]},
+        {"visibility": "internal", "shared_with": "carol"},
+    ]
+
+    for user in users:
+        expected = [engine.evaluate(user, doc) for doc in docs]
+        assert engine.evaluate_batch(user, docs) == expected
+
+    assert engine.evaluate_batch({"id": "alice"}, []) == []
+
+
+def test_evaluate_batch_explicit_deny_under_default_allow():
+    """Explicit rules still deny in batches when the default is allow."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "restricted",
+                "match": {"level": "restricted"},
+                "allow": {"roles": ["admin"]},
+            },
+            {
+                "name": "team",
+                "match": {"level": ["team", "restricted"]},
+                "allow": {"conditions": ["user.team == document.team"]},
+            },
+            {
+                "name": "owner",
+                "allow": {"conditions": ["user.id == document.owner"]},
+            },
+        ],
+        "default": "allow",
+    })
+    engine = PolicyEngine(policy)
+
+    users = [{}, {"id": "a", "roles": ["admin"], "team": "x"}, {"id": "b", "team": "y"}]
+    docs = [
+        {},
+        {"level": "restricted", "team": "x"},
+        {"level": "team", "team": "y", "owner": "a"},
+        {"level": "team", "team": "x"},
+        {"level": "open", "owner": "b"},
+    ]
+
+    for user in users:
+        assert engine.evaluate_batch(user, docs) == [engine.evaluate(user, doc) for doc in docs]
+
+
+def test_evaluate_batch_skips_rules_missing_user_keys():
+    """Rules needing a user field the user lacks are settled once per batch."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "institution",
+                "allow": {"conditions": ["user.institution == document.institution"]},
+            },
+            {
+                "name": "grant",
+                "allow": {"conditions": ["user.id in document.granted_users"]},
+            },
+        ],
+        "default": "deny",
+    })
+    engine = PolicyEngine(policy)
+
+    assert engine._required_user_keys == {0: frozenset({"institution"})}
+    assert engine._user_rule_plan({"id": "a"}, policy.rules[0].allow, 0) is False
+    assert callable(engine._user_rule_plan({"institution": "MIT"}, policy.rules[0].allow, 0))
+
+    docs = [{"institution": "MIT", "granted_users": ["a"]}, {"institution": "MIT"}]
+    for user in [{"id": "a"}, {"id": "b", "institution": "MIT"}, {"institution": None}]:
+        assert engine.evaluate_batch(user, docs) == [engine.evaluate(user, doc) for doc in docs]
+
+
+
+def test_evaluate_batch_malformed_user_fields_match_evaluate():
+    """Rules evaluate() never consults don't inspect the user in batches either."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "untagged",
+                "allow": {"conditions": ["'b' not in document.tags"]},
+            },
+            {
+                "name": "reviewers",
+                "match": {"category": ["b", "c"]},
+                "allow": {"roles": ["x"]},
+            },
+        ],
+        "default": "allow",
+    })
+    engine = PolicyEngine(policy)
+
+    docs = [{"category": "zzz"}, {"tags": ["a"]}, {}]
+    for user in [{"id": "u", "roles": 1}, {"id": "u", "roles": None}, {"id": "u", "roles": "x"}]:
+        assert engine.evaluate_batch(user, docs) == [engine.evaluate(user, doc) for doc in docs]
+
+    # Under a default deny the catch-all rule is reached, but it reads no roles
+    deny_policy = Policy.from_dict({**policy.model_dump(), "default": "deny"})
+    deny_engine = PolicyEngine(deny_policy)
+    user = {"id": "u", "roles": 1}
+    assert deny_engine.evaluate_batch(user, docs) == [deny_engine.evaluate(user, doc) for doc in docs]
+
+
+def test_compiled_conditions_shared_across_engines():
+    """Engines built from the same policy reuse its compiled conditions."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "department",
+                "allow": {"conditions": ["user.department == document.department"]},
+            }
+        ],
+        "default": "deny",
+    })
+
+    first = PolicyEngine(policy)
+    second = PolicyEngine(policy)
+
+    assert first._compiled_predicates[0] is second._compiled_predicates[0]
+    assert second.evaluate({"department": "eng"}, {"department": "eng"}) is True
+
+
+def test_compiled_conditions_recompiled_after_rule_change():
+    """Modifying a policy's conditions invalidates its compiled cache."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "department",
+                "allow": {"conditions": ["user.department == document.department"]},
+            }
+        ],
+        "default": "deny",
+    })
+    PolicyEngine(policy)
+
+    policy.rules[0].allow.conditions = ["user.team == document.team"]
+    engine = PolicyEngine(policy)
+
+    assert engine.evaluate({"department": "eng"}, {"department": "eng"}) is False
+    assert engine.evaluate({"team": "core"}, {"team": "core"}) is True
+
+
+def test_everyone_rules_skip_user_checks():
+    """Rules allowing everyone are decided by their conditions alone."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [
+            {
+                "name": "drafts",
+                "match": {"status": "draft"},
+                "allow": {"everyone": True, "conditions": ["user.id == document.owner"]},
+            },
+            {
+                "name": "public",
+                "allow": {"everyone": True, "conditions": ["'public' in document.tags"]},
+            },
+            {"name": "open", "match": {"status": "open"}, "allow": {"everyone": True}},
+        ],
+        "default": "deny",
+    })
+    engine = PolicyEngine(policy)
+
+    assert set(engine._everyone_plans) == {0, 1, 2}
+    assert engine._everyone_plans[2] is True
+
+    class NoRoles(dict):
+        def get(self, key, default=None):
+            assert key != "roles", "roles looked up for an everyone rule"
+            return super().get(key, default)
+
+    user = NoRoles(id="alice")
+    assert engine.evaluate(user, {"tags": ["public"]}) is True
+    assert engine.evaluate(user, {"tags": ["private"]}) is False
+    assert engine.evaluate(user, {"status": "draft", "owner": "alice"}) is True
+    assert engine.evaluate(user, {"status": "draft", "owner": "bob", "tags": ["public"]}) is False
+    assert engine.evaluate(user, {"status": "open"}) is True
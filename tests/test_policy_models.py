@@ -61,5 +61,125 @@ def test_rule_match_validation_list_value():
     assert rule.match == {"status": ["active", "pending"]}
 
 
+JSON_SIZE_CASES = [
+    {},
+    [],
+    {"version": "1", "rules": [{"name": "r", "allow": {"everyone": True}}], "default": "deny"},
+    {"a": [1, -2.5, True, False, None, "caf\u00e9 \u2603 \U0001F600", (1, "x")]},
+    {1: "a", 2.5: "b", None: "d", float("nan"): 1, float("inf"): [float("-inf")]},
+    {True: "c", None: "d"},
+    {"quote": "\"\\\n\t\x00", "big": -12345678901234567890, "tiny": -2.2250738585072014e-308},
+]
+
+
+@pytest.mark.parametrize("data", JSON_SIZE_CASES)
+def test_json_size_matches_json_dumps(data):
+    """The streaming size check counts exactly what json.dumps produces."""
+    import json
+
+    from ragguard.policy.models import _json_size
+
+    assert _json_size(data, 10**9) == len(json.dumps(data).encode("utf-8"))
+
+
+def test_json_size_stops_at_limit():
+    """Counting stops once the limit is exceeded, before the rest is read."""
+    from ragguard.policy.models import _json_size
+
+    class Unreachable:
+        pass
+
+    # The unserializable value after the oversized one is never visited
+    size = _json_size({"a": "x" * 100, "b": Unreachable()}, 50)
+    assert 50 < size < 120
+
+
+def test_json_size_errors_match_json_dumps():
+    """Unserializable and circular data fail as json.dumps would."""
+    from ragguard.policy.models import _json_size
+
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        _json_size({"a": object()}, 1000)
+    with pytest.raises(TypeError, match="keys must be"):
+        _json_size({("a",): 1}, 1000)
+
+    circular = {}
+    circular["self"] = circular
+    with pytest.raises(ValueError, match="Circular reference"):
+        _json_size(circular, 10**9)
+
+
+@pytest.mark.parametrize("data", JSON_SIZE_CASES)
+def test_json_size_estimate_bounds_json_dumps(data):
+    """The size estimate never undercounts what json.dumps produces."""
+    import json
+
+    from ragguard.policy.models import _json_size_estimate
+
+    assert _json_size_estimate(data, 10**9) >= len(json.dumps(data).encode("utf-8"))
+
+
+def test_json_size_estimate_flags_possibly_oversized_input():
+    """Input over the limit, or too large to estimate, gets no bound."""
+    from ragguard.policy.models import _json_size_estimate
+
+    limit = 1_000_000
+    rule = {"name": "r", "allow": {"everyone": True}}
+    assert _json_size_estimate({"version": "1", "rules": [rule], "default": "deny"}, limit) < 1000
+
+    many_rules = {
+        "version": "1",
+        "rules": [{"name": "x" * 12_000, "allow": {"everyone": True}}] * 100,
+    }
+    one_string = {"version": "1", "rules": [{"name": "x" * 5_000_000, "allow": {}}]}
+    deep = []
+    for _ in range(20_000):
+        deep = [deep]
+    circular = {}
+    circular["self"] = circular
+
+    for data in (many_rules, one_string, {"rules": deep}, circular):
+        assert _json_size_estimate(data, limit) is None
+
+
+def test_policy_size_check_skips_json_dumps(monkeypatch):
+    """Normal and oversized policies are checked without json.dumps."""
+    import json
+
+    from ragguard.policy.models import Policy
+
+    def no_dumps(*args, **kwargs):
+        raise AssertionError("json.dumps called by the policy size check")
+
+    monkeypatch.setattr(json, "dumps", no_dumps)
+
+    Policy.from_dict({"version": "1", "rules": [{"name": "r", "allow": {"everyone": True}}]})
+
+    oversized = {
+        "version": "1",
+        "rules": [{"name": "x" * 12_000, "allow": {"everyone": True}}] * 100,
+    }
+    expected = r"^Policy too large: at least 10\d{5} bytes > 1000000 bytes"
+    with pytest.raises(ValueError, match=expected):
+        Policy.from_dict(oversized)
+
+
+def test_policy_near_size_limit_reports_exact_size():
+    """Input the estimate can't settle is measured exactly, with the original wording."""
+    import json
+
+    from ragguard.policy.models import Policy
+
+    # Under the estimate's lower bound but over the limit once escaped
+    data = {"version": "1", "rules": [{"name": "\u2603" * 200_000, "allow": {}}]}
+    size = len(json.dumps(data).encode("utf-8"))
+
+    with pytest.raises(ValueError, match=rf"^Policy too large: {size} bytes > 1000000 bytes"):
+        Policy.from_dict(data)
+
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        Policy.from_dict({"version": "1", "rules": [], "extra": object()})
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
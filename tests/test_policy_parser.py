@@ -180,3 +180,46 @@ def test_parse_policy_with_all_features():
     assert policy.rules[1].allow.roles == ["manager", "employee"]
     assert policy.rules[1].match == {"type": "internal"}
     assert policy.rules[2].allow.conditions == ["user.id in document.shared_with"]
+
+
+def test_parse_policy_from_json_file():
+    """Test parsing a policy from a .json file."""
+    json_content = """
+{
+  "version": "1",
+  "rules": [
+    {"name": "test-rule", "allow": {"conditions": ["user.id in document.shared_with"]}}
+  ],
+  "default": "deny"
+}
+"""
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        f.write(json_content)
+        temp_path = f.name
+
+    try:
+        policy = PolicyParser.from_file(temp_path)
+        assert policy.version == "1"
+        assert policy.rules[0].allow.conditions == ["user.id in document.shared_with"]
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_parse_policy_from_json_string():
+    """Test parsing a policy from JSON text and bytes."""
+    json_content = '{"version": "1", "rules": [{"name": "r", "allow": {"everyone": true}}]}'
+
+    for data in (json_content, json_content.encode("utf-8")):
+        policy = PolicyParser.from_json_string(data)
+        assert policy.rules[0].allow.everyone is True
+        assert policy.default == "deny"
+
+
+def test_parse_policy_invalid_json():
+    """Test that malformed or non-object JSON raises PolicyError."""
+    with pytest.raises(PolicyError, match="Failed to parse JSON"):
+        PolicyParser.from_json_string('{"version": "1", "rules": [')
+
+    with pytest.raises(PolicyError, match="must be an object"):
+        PolicyParser.from_json_string('["not", "a", "policy"]')
@@ -0,0 +1,393 @@
+"""
+Tests for compiling condition trees to predicate closures.
+
+The predicates must agree with CompiledConditionEvaluator on every input,
+since PolicyEngine.evaluate now uses them instead of the tree walker.
+"""
+
+import pytest
+
+from ragguard.policy import Policy, PolicyEngine
+from ragguard.policy.compiler import (
+    CompiledCondition,
+    CompiledConditionEvaluator,
+    CompiledValue,
+    ConditionCompiler,
+    ConditionOperator,
+    PredicateCompiler,
+    ValueType,
+)
+
+CONDITIONS = [
+    "user.department == document.department",
+    "user.id != document.owner",
+    "document.status == 'active'",
+    "document.status != 'archived'",
+    "document.category in ['cs.AI', 'cs.LG']",
+    "document.category not in ['cs.AI', 'cs.LG']",
+    "user.id in document.authorized_users",
+    "user.id not in document.blocked_users",
+    "'public' in document.tags",
+    "document.priority > 5",
+    "document.priority < 5",
+    "document.priority >= 5",
+    "document.priority <= 5",
+    "user.clearance >= document.required_clearance",
+    "document.reviewed_at exists",
+    "document.draft_notes not exists",
+    "document.metadata.team == user.team",
+    "(user.role == 'admin' OR document.status == 'public')",
+    "(document.priority > 3 AND document.status != 'archived')",
+    "((user.role == 'admin' OR user.role == 'manager') AND document.dept == user.dept)",
+    "'active' == document.status",
+    "document.owner == 'café'",
+    "document.level in [1, 2, 'three']",
+    "document.level not in [1, 2, 'three']",
+    "'public' not in document.tags",
+    "5 < document.priority",
+    "3 >= user.clearance",
+    "document.priority <= 7.5",
+]
+
+USERS = [
+    {},
+    {"id": "alice", "department": "eng", "role": "admin", "clearance": 3,
+     "team": "core", "dept": "eng"},
+    {"id": "bob", "department": "sales", "role": "manager", "clearance": "high"},
+    {"id": None, "department": None},
+]
+
+DOCUMENTS = [
+    {},
+    {"department": "eng", "owner": "bob", "status": "active", "category": "cs.AI",
+     "authorized_users": ["alice", "carol"], "blocked_users": ["bob"], "tags": ["public"],
+     "priority": 7, "required_clearance": 2, "reviewed_at": "2024-01-01",
+     "metadata": {"team": "core"}, "dept": "eng"},
+    {"department": "sales", "owner": "alice", "status": "archived", "category": "cs.DB",
+     "authorized_users": "alice", "blocked_users": [], "tags": ["private"],
+     "priority": "high", "draft_notes": "wip", "metadata": "flat"},
+    {"status": "public", "priority": 5, "required_clearance": 3, "metadata": {"team": None}},
+    {"status": ["active"], "owner": "café", "level": 2, "tags": ["public", 1, None],
+     "category": 7},
+    {"status": 1, "owner": "cafe", "level": "three", "tags": [], "category": ["cs.AI"]},
+]
+
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_predicate_matches_evaluator(condition):
+    """Compiled predicates return exactly what the tree evaluator returns."""
+    node = ConditionCompiler.compile_expression(condition)
+    predicate = PredicateCompiler.compile_node(node)
+
+    for user in USERS:
+        for document in DOCUMENTS:
+            expected = CompiledConditionEvaluator.evaluate_node(node, user, document)
+            assert predicate(user, document) is expected, (condition, user, document)
+
+
+def test_none_equals_none_denied():
+    """Missing fields on both sides must not satisfy equality."""
+    predicate = PredicateCompiler.compile_node(
+        ConditionCompiler.compile_expression("user.team == document.team")
+    )
+    assert predicate({}, {}) is False
+
+
+def test_type_mismatch_in_comparison_denies():
+    """Comparing incompatible types denies instead of raising."""
+    predicate = PredicateCompiler.compile_node(
+        ConditionCompiler.compile_expression("document.priority > 5")
+    )
+    assert predicate({}, {"priority": "urgent"}) is False
+
+
+def test_missing_right_operand_never_matches():
+    """A binary condition without a right operand is always False."""
+    condition = CompiledCondition(
+        operator=ConditionOperator.EQUALS,
+        left=CompiledValue(ValueType.DOCUMENT_FIELD, None, ("status",)),
+        right=None,
+        original="document.status ==",
+    )
+    predicate = PredicateCompiler.compile_node(condition)
+    assert predicate({}, {"status": "active"}) is False
+
+
+def test_unknown_node_type_raises():
+    """Non-condition nodes are rejected at compile time."""
+    with pytest.raises(ValueError, match="Unknown node type"):
+        PredicateCompiler.compile_node("document.status == 'active'")
+
+
+def test_engine_uses_compiled_predicates():
+    """PolicyEngine fuses a rule's conditions into one predicate."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [{
+            "name": "combined",
+            "allow": {
+                "conditions": [
+                    "user.id in document.authorized_users",
+                    "document.status == 'active'",
+                ]
+            }
+        }],
+        "default": "deny"
+    })
+    engine = PolicyEngine(policy)
+
+    assert callable(engine._compiled_predicates[0])
+    assert engine.evaluate({"id": "alice"}, {"authorized_users": ["alice"], "status": "active"})
+    assert not engine.evaluate({"id": "alice"}, {"authorized_users": ["alice"], "status": "draft"})
+    assert not engine.evaluate({"id": "bob"}, {"authorized_users": ["alice"], "status": "active"})
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 5])
+def test_conjunction_requires_every_condition(count):
+    """Fused rule predicates AND all conditions at every arity."""
+    nodes = [
+        ConditionCompiler.compile_expression(f"document.f{i} == 'yes'")
+        for i in range(count)
+    ]
+    predicate = PredicateCompiler.compile_conjunction(nodes)
+
+    passing = {f"f{i}": "yes" for i in range(count)}
+    assert predicate({}, passing) is True
+    for i in range(count):
+        failing = dict(passing, **{f"f{i}": "no"})
+        assert predicate({}, failing) is False
+
+
+def test_conjunction_rejects_empty_list():
+    """An empty condition list has no meaningful predicate."""
+    with pytest.raises(ValueError, match="empty"):
+        PredicateCompiler.compile_conjunction([])
+
+
+def test_cost_estimate_orders_scalar_checks_first():
+    """Scalar comparisons are estimated cheaper than list membership."""
+    from ragguard.policy.compiler.predicate_compiler import estimate_cost
+
+    equals = ConditionCompiler.compile_expression("document.status == 'active'")
+    field_in = ConditionCompiler.compile_expression("user.id in document.authorized_users")
+    literal_in = ConditionCompiler.compile_expression("document.category in ['a', 'b', 'c']")
+    expression = ConditionCompiler.compile_expression(
+        "(document.status == 'active' OR user.id in document.authorized_users)"
+    )
+
+    assert estimate_cost(equals) == 1
+    assert estimate_cost(literal_in) == 3
+    assert estimate_cost(equals) < estimate_cost(literal_in) < estimate_cost(field_in)
+    assert estimate_cost(expression) == estimate_cost(equals) + estimate_cost(field_in)
+
+
+def test_cost_estimate_reflects_digest_set_lists():
+    """Long string lists are matched by digest lookup, not by scanning."""
+    from ragguard.policy.compiler.predicate_compiler import estimate_cost
+
+    categories = [f"cs.{i:03d}" for i in range(100)]
+    digest_in = ConditionCompiler.compile_expression(f"document.category in {categories}")
+    numbers_in = ConditionCompiler.compile_expression(f"document.level in {list(range(100))}")
+    literal_in = ConditionCompiler.compile_expression("document.category in ['a', 'b', 'c']")
+
+    assert estimate_cost(digest_in) < estimate_cost(literal_in)
+    assert estimate_cost(numbers_in) == 100
+
+
+def test_conjunction_evaluates_cheapest_condition_first():
+    """A failing scalar check short-circuits before list membership runs."""
+    nodes = [
+        ConditionCompiler.compile_expression("user.id in document.authorized_users"),
+        ConditionCompiler.compile_expression("document.status == 'active'"),
+    ]
+    predicate = PredicateCompiler.compile_conjunction(nodes)
+
+    class ExplodingList(list):
+        def __iter__(self):
+            raise AssertionError("membership evaluated before cheaper condition")
+
+    document = {"status": "archived", "authorized_users": ExplodingList(["alice"])}
+    assert predicate({"id": "alice"}, document) is False
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 5, 15, 16, 40])
+def test_literal_list_membership_matches_secure_contains(size):
+    """Unrolled, looped and digest-set membership all agree with secure_contains."""
+    from ragguard.policy.compiler.predicate_compiler import _make_literal_list_matcher
+    from ragguard.utils import secure_contains
+
+    items = [f"cat-{i}" for i in range(size)]
+    contains = _make_literal_list_matcher(items)
+
+    probes = items + ["cat-x", "", "CAT-0", "cat-0 ", "\ud800", None, 0, ["cat-0"], b"cat-0"]
+    for probe in probes:
+        assert contains(probe) == secure_contains(probe, items), probe
+
+
+def test_literal_list_membership_mixed_types():
+    """Lists mixing strings and numbers fall back to item-by-item comparison."""
+    from ragguard.policy.compiler.predicate_compiler import _make_literal_list_matcher
+    from ragguard.utils import secure_contains
+
+    items = ["a", 1, 2.5, True, "\ud800"]
+    contains = _make_literal_list_matcher(items)
+
+    for probe in ["a", "b", 1, 2.5, 3, True, False, None, "\ud800"]:
+        assert contains(probe) == secure_contains(probe, items), probe
+
+
+def test_compile_match_matches_engine_semantics():
+    """Compiled match blocks agree with PolicyEngine._document_matches_rule."""
+    policy = Policy.from_dict({
+        "version": "1",
+        "rules": [{
+            "name": "match",
+            "match": {"type": ["paper", "report"], "metadata.team": "core", "public": True},
+            "allow": {"everyone": True}
+        }],
+        "default": "deny"
+    })
+    engine = PolicyEngine(policy)
+    rule = policy.rules[0]
+    matcher = PredicateCompiler.compile_match(rule.match)
+
+    documents = [
+        {},
+        {"type": "paper", "metadata": {"team": "core"}, "public": True},
+        {"type": "report", "metadata": {"team": "core"}, "public": 1},
+        {"type": "memo", "metadata": {"team": "core"}, "public": True},
+        {"type": "paper", "metadata": {"team": "edge"}, "public": True},
+        {"type": "paper", "metadata": "core", "public": True},
+    ]
+    for document in documents:
+        assert matcher(document) is engine._document_matches_rule(document, rule), document
+
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_required_document_keys_are_sound(condition):
+    """A node is never satisfied by a document missing one of its required keys."""
+    from ragguard.policy.compiler.predicate_compiler import required_document_keys
+
+    node = ConditionCompiler.compile_expression(condition)
+    required = required_document_keys(node)
+
+    for user in USERS:
+        for document in DOCUMENTS:
+            if not required <= document.keys():
+                assert CompiledConditionEvaluator.evaluate_node(node, user, document) is False
+
+
+def test_required_document_keys():
+    """Only keys whose absence forces a denial are required."""
+    from ragguard.policy.compiler.predicate_compiler import required_document_keys
+
+    def required(condition):
+        return required_document_keys(ConditionCompiler.compile_expression(condition))
+
+    assert required("user.team == document.metadata.team") == {"metadata"}
+    assert required("user.id in document.authorized_users") == {"authorized_users"}
+    assert required("document.category in ['a', 'b']") == {"category"}
+    assert required("document.category not in ['a', 'b']") == frozenset()
+    assert required("document.draft_notes not exists") == frozenset()
+    assert required("document.reviewed_at exists") == {"reviewed_at"}
+    assert required("(document.a == 'x' AND document.b == 'y')") == {"a", "b"}
+    assert required("(document.a == 'x' OR document.b == 'y')") == frozenset()
+    assert required("(document.a == 'x' OR document.a == 'y')") == {"a"}
+
+
+def test_conjunction_denies_missing_required_keys_first():
+    """Fused rules check key presence before running any condition."""
+    nodes = [
+        ConditionCompiler.compile_expression(condition)
+        for condition in CONDITIONS[:6] + ["document.category in ['cs.AI', 'cs.LG']"]
+    ]
+    predicate = PredicateCompiler.compile_conjunction(nodes)
+
+    for user in USERS:
+        for document in DOCUMENTS:
+            expected = all(
+                CompiledConditionEvaluator.evaluate_node(node, user, document) for node in nodes
+            )
+            assert predicate(user, document) is expected, (user, document)
+
+    class ExplodingDict(dict):
+        def get(self, key, default=None):
+            raise AssertionError("condition evaluated despite missing key")
+
+    assert predicate(USERS[1], ExplodingDict(status="active")) is False
+    assert predicate(USERS[1], None) is False
+
+
+@pytest.mark.parametrize("path", [("a",), ("a", "b"), ("a", "b", "c"), ("a", "b", "c", "d")])
+def test_path_getter_shapes(path):
+    """Single, unrolled two/three-segment and looped getters agree on every shape."""
+    from ragguard.policy.compiler.predicate_compiler import _make_path_getter
+
+    get = _make_path_getter(path)
+    objects = [
+        None, "flat", {}, {"a": None}, {"a": "x"}, {"a": {}}, {"a": {"b": None}},
+        {"a": {"b": "y"}}, {"a": {"b": {"c": "z"}}}, {"a": {"b": {"c": 0}}}, {"a": ["b"]},
+        {"a": {"b": {"c": None}}}, {"a": {"b": {"c": {"d": "w"}}}}, {"a": {"b": {"c": {}}}},
+    ]
+    for obj in objects:
+        assert get(obj) == CompiledConditionEvaluator._get_nested_value(obj, path), obj
+
+
+@pytest.mark.parametrize("condition", [
+    "document.status == 'active'",
+    "'active' != document.status",
+    "document.status in ['active', 'review']",
+    "document.status not in ['active', 'review']",
+])
+def test_top_level_document_key_predicates(condition):
+    """Direct-probe predicates for document.<key> agree with the evaluator."""
+    node = ConditionCompiler.compile_expression(condition)
+    predicate = PredicateCompiler.compile_condition(node)
+
+    documents = [None, "flat", {}, {"status": None}, {"status": "active"}, {"status": "draft"}, {"status": 1}]
+    for document in documents:
+        expected = CompiledConditionEvaluator.evaluate_node(node, {}, document)
+        assert predicate({}, document) is expected, document
+
+
+@pytest.mark.parametrize("operator, expected", [("==", False), ("!=", True)])
+def test_top_level_document_key_equality_with_non_bool_eq(operator, expected):
+    """Values whose == returns a non-bool falsy object still deny on ==."""
+    class FalsyResult:
+        def __bool__(self):
+            return False
+
+    class OddValue:
+        def __eq__(self, other):
+            return FalsyResult()
+
+    predicate = PredicateCompiler.compile_condition(
+        ConditionCompiler.compile_expression(f"document.status {operator} 'active'")
+    )
+    assert predicate({}, {"status": OddValue()}) is expected
+
+
+def test_literal_ordering_logs_in_source_order(caplog):
+    """Specialized literal comparisons keep the operand order in warnings."""
+    predicate = PredicateCompiler.compile_node(
+        ConditionCompiler.compile_expression("5 < document.priority")
+    )
+
+    with caplog.at_level("WARNING"):
+        assert predicate({}, {"priority": "urgent"}) is False
+
+    assert "cannot compare 5 < urgent" in caplog.text
+
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_required_user_keys_are_sound(condition):
+    """A node is never satisfied by a user missing one of its required keys."""
+    from ragguard.policy.compiler.predicate_compiler import required_user_keys
+
+    node = ConditionCompiler.compile_expression(condition)
+    required = required_user_keys(node)
+
+    for user in USERS:
+        if not required <= user.keys():
+            for document in DOCUMENTS:
+                assert CompiledConditionEvaluator.evaluate_node(node, user, document) is False
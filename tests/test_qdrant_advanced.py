@@ -42,6 +42,9 @@ def create_mock_qdrant_client():
     mock_response = Mock()
     mock_response.points = [mock_point]
     mock_client.query_points = Mock(return_value=mock_response)
+    mock_client.query_batch_points = Mock(
+        side_effect=lambda collection_name, requests, **kwargs: [mock_response for _ in requests]
+    )
 
     # Mock collection info
     mock_info = Mock()
@@ -15,6 +15,7 @@ except ImportError:
 
 from ragguard import Policy, QdrantSecureRetriever
 from ragguard.audit import NullAuditLogger
+from ragguard.exceptions import RetrieverError
 
 
 @pytest.mark.skipif(not QDRANT_AVAILABLE, reason="qdrant-client not installed")
@@ -226,3 +227,100 @@ class TestQdrantSecureRetriever:
         )
 
         assert retriever.backend_name == "qdrant"
+
+
+def _batch_retriever():
+    """Retriever over a small 3-dimensional collection for batch search tests."""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="test",
+        vectors_config=VectorParams(size=3, distance=Distance.COSINE)
+    )
+    client.upsert(
+        collection_name="test",
+        points=[
+            PointStruct(id=1, vector=[0.1, 0.2, 0.3], payload={"department": "engineering"}),
+            PointStruct(id=2, vector=[0.3, 0.2, 0.1], payload={"department": "engineering"}),
+            PointStruct(id=3, vector=[0.2, 0.2, 0.2], payload={"department": "sales"}),
+        ]
+    )
+
+    policy = Policy.from_dict({
+        'version': '1',
+        'rules': [
+            {
+                'name': 'dept',
+                'allow': {'conditions': ['user.department == document.department']}
+            }
+        ],
+        'default': 'deny'
+    })
+
+    return client, QdrantSecureRetriever(client=client, collection='test', policy=policy)
+
+
+@pytest.mark.skipif(not QDRANT_AVAILABLE, reason="qdrant-client not installed")
+def test_qdrant_batch_search_matches_single_searches():
+    """Test Qdrant batch search sends one request and filters like search()."""
+    client, retriever = _batch_retriever()
+    user = {'id': 'alice', 'department': 'engineering'}
+    queries = [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]
+
+    original = client.query_batch_points
+    batch_calls = []
+
+    def counting_query_batch_points(*args, **kwargs):
+        batch_calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    client.query_batch_points = counting_query_batch_points
+    batch_results = retriever.batch_search(queries, user=user, limit=5)
+
+    assert len(batch_calls) == 1
+    assert len(batch_results) == 2
+    for query, results in zip(queries, batch_results):
+        single = retriever.search(query, user=user, limit=5)
+        assert [point.id for point in results] == [point.id for point in single]
+        assert all(point.payload["department"] == "engineering" for point in results)
+
+
+@pytest.mark.skipif(not QDRANT_AVAILABLE, reason="qdrant-client not installed")
+def test_qdrant_batch_search_accepts_search_kwargs():
+    """Test batch_search takes the same query_points arguments as search()."""
+    from qdrant_client.models import SearchParams
+
+    client, retriever = _batch_retriever()
+    user = {'id': 'alice', 'department': 'engineering'}
+    queries = [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]
+
+    original = client.query_batch_points
+    batch_calls = []
+
+    def counting_query_batch_points(*args, **kwargs):
+        batch_calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    client.query_batch_points = counting_query_batch_points
+
+    # Renamed to QueryRequest fields and still sent as one request
+    search_kwargs = {'with_vectors': True, 'search_params': SearchParams(exact=True)}
+    batch_results = retriever.batch_search(queries, user=user, limit=5, **search_kwargs)
+
+    assert len(batch_calls) == 1
+    for query, results in zip(queries, batch_results):
+        single = retriever.search(query, user=user, limit=5, **search_kwargs)
+        assert [point.id for point in results] == [point.id for point in single]
+        assert all(point.vector is not None for point in results)
+
+    batch_results = retriever.batch_search(
+        queries, user=user, limit=5, shard_key_selector=None, consistency=None, timeout=10
+    )
+    assert len(batch_calls) == 2
+    assert [len(results) for results in batch_results] == [2, 2]
+
+    # Anything else falls back to one search per query and fails like search()
+    with pytest.raises(RetrieverError, match="Unknown arguments: \\['bogus'\\]"):
+        retriever.search(queries[0], user=user, limit=5, bogus=1)
+    with pytest.raises(RetrieverError, match="Unknown arguments: \\['bogus'\\]"):
+        retriever.batch_search(queries, user=user, limit=5, bogus=1)
+    assert len(batch_calls) == 2
@@ -93,6 +93,12 @@ class TestNestedValue:
         assert get_nested_value(data, "user.email", "default") == "default"
         assert get_nested_value(data, "missing.path", "default") == "default"
 
+    def test_get_nested_value_stored_none(self):
+        """A key present with value None is returned as None, not the default."""
+        data = {"user": {"team": None}}
+        assert get_nested_value(data, "user.team", "default") is None
+        assert get_nested_value(data, "user.team.name", "default") == "default"
+
     def test_get_nested_value_empty(self):
         assert get_nested_value({}, "any.path") is None
         assert get_nested_value(None, "any.path") is None